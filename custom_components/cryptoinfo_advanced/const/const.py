@@ -22,6 +22,38 @@ CONF_BLOCK_TIME_MINUTES = "block_time_minutes"
 CONF_DIFFICULTY_WINDOW = "difficulty_window"
 CONF_HALVING_WINDOW = "halving_window"
 CONF_MAX_FETCH_FAILURES = "max_fetch_failures"
+CONF_DEADBAND_ABSOLUTE = "deadband_absolute"
+CONF_DEADBAND_RELATIVE = "deadband_relative"
+CONF_MIN_WRITE_INTERVAL = "min_write_interval"
+CONF_HISTORY_SIZE = "history_size"
+CONF_EXTRA_SENSOR_WINDOW = "window"
+CONF_EXTRA_SENSOR_TARGET = "target"
+CONF_HISTORY_DAYS = "history_days"
+CONF_HTTP_SESSION = "http_session"
+CONF_REQUEST_TIMEOUT = "request_timeout"
+CONF_HTTP_LIMIT_PER_HOST = "http_limit_per_host"
+CONF_HTTP_DNS_CACHE_TTL = "http_dns_cache_ttl"
+CONF_HTTP_KEEPALIVE_TIMEOUT = "http_keepalive_timeout"
+CONF_ADAPTIVE_POLLING = "adaptive_polling"
+CONF_ADAPTIVE_MIN_FREQUENCY = "adaptive_min_frequency"
+CONF_ADAPTIVE_MAX_FREQUENCY = "adaptive_max_frequency"
+CONF_ADAPTIVE_THRESHOLD = "adaptive_threshold"
+CONF_BLOCK_GATING = "block_gating"
+CONF_BLOCK_GATING_MAX_STALENESS = "block_gating_max_staleness"
+CONF_HOLDINGS = "holdings"
+CONF_LOOP_MONITOR = "loop_monitor"
+CONF_EXECUTOR_THRESHOLD = "executor_threshold"
+CONF_LOOP_MONITOR_THRESHOLD = "loop_monitor_threshold"
+CONF_HOLDING_AMOUNT = "amount"
+CONF_HOLDING_WALLET = "wallet"
+CONF_TRAFFIC_MODE = "traffic_mode"
+CONF_TRAFFIC_FILE = "traffic_file"
+CONF_TRAFFIC_TIMING_SCALE = "traffic_timing_scale"
+CONF_SERVE_STALE = "serve_stale"
+CONF_MAX_STALENESS = "max_staleness"
+CONF_HEDGE_REQUESTS = "hedge_requests"
+CONF_HEDGE_PERCENTILE = "hedge_percentile"
+CONF_API_BASE_URL = "api_base_url"
 
 SENSOR_PREFIX = "Cryptoinfo "
 ATTR_LAST_UPDATE = "last_update"
@@ -76,6 +108,8 @@ ATTR_MEMPOOL_TOTAL_FEE = "mempool_total_fee"
 ATTR_MEMPOOL_TOTAL_FEE_CALC = "mempool_total_fee_calc"
 ATTR_MEMPOOL_SIZE_CALC = "mempool_size_calc"
 ATTR_MEMPOOL_AVERAGE_FEE_PER_TX = "mempool_average_fee_per_tx"
+ATTR_MEMPOOL_FEE_RATE_FOR_DEPTH = "mempool_fee_rate_for_depth"
+ATTR_MEMPOOL_DEPTH_AHEAD_OF_FEE_RATE = "mempool_depth_ahead_of_fee_rate"
 ATTR_MEMPOOL_FEES_FASTEST = "mempool_fees_fastest"
 ATTR_MEMPOOL_FEES_30MIN = "mempool_fees_30min"
 ATTR_MEMPOOL_FEES_60MIN = "mempool_fees_60min"
@@ -91,8 +125,41 @@ ATTR_MEMPOOL_NEXT_BLOCK_FEE_RANGE_MIN = "mempool_next_block_fee_range_min"
 ATTR_MEMPOOL_NEXT_BLOCK_FEE_RANGE_MAX = "mempool_next_block_fee_range_max"
 ATTR_MEMPOOL_NEXT_BLOCK_FEE_RANGE_COMBINED = "mempool_next_block_fee_range_combined"
 
+ATTR_EFFECTIVE_UPDATE_INTERVAL = "effective_update_interval"
+ATTR_DATA_CHANGED = "data_changed"
+ATTR_DATA_STALE = "stale"
+
+ATTR_ROLLING_MEAN = "rolling_mean"
+ATTR_ROLLING_STDDEV = "rolling_stddev"
+ATTR_ROLLING_MIN = "rolling_min"
+ATTR_ROLLING_MAX = "rolling_max"
+ATTR_ROLLING_RATE_OF_CHANGE = "rolling_rate_of_change"
+
+ATTR_ORPHANS_7D = "orphans_7d"
+ATTR_ORPHANS_30D = "orphans_30d"
+ATTR_ORPHAN_RATE_30D = "orphan_rate_30d"
+
+ATTR_PRICE_SMA = "price_sma"
+ATTR_PRICE_EMA = "price_ema"
+ATTR_PRICE_RSI = "price_rsi"
+ATTR_PRICE_BOLLINGER_UPPER = "price_bollinger_upper"
+ATTR_PRICE_BOLLINGER_LOWER = "price_bollinger_lower"
+ATTR_PRICE_REALISED_VOLATILITY = "price_realised_volatility"
+
+ATTR_PORTFOLIO_AMOUNT = "amount"
+ATTR_PORTFOLIO_PRICE = "price"
+ATTR_PORTFOLIO_ALLOCATION = "allocation"
+ATTR_PORTFOLIO_COIN_VALUES = "coin_values"
+ATTR_PORTFOLIO_COIN_ALLOCATIONS = "coin_allocations"
+ATTR_PORTFOLIO_WALLET_VALUES = "wallet_values"
+ATTR_PORTFOLIO_MISSING_PRICES = "missing_prices"
+
 PROPERTY_POOL_CONTROL_REMAINING = "remaining_percentage"
 
+DEPENDENCY_HASHRATE = "hashrate"
+DEPENDENCY_BLOCK_TIME = "block_time"
+DEPENDENCY_HASH_CONTROL = "hash_control"
+
 API_BASE_URL_COINGECKO = "https://api.coingecko.com/api/v3/"
 API_BASE_URL_CRYPTOID = "https://chainz.cryptoid.info/"
 API_BASE_URL_MEMPOOLSPACE = "https://mempool.space/api/"
@@ -105,6 +172,11 @@ API_ENDPOINT_PRICE_ALT = (
     "{0}simple/price?ids={1}&vs_currencies={2}"
     "&include_market_cap=true&include_24hr_vol=true&include_24hr_change=true&include_last_updated_at=true"
 )
+API_ENDPOINT_PRICE_MAIN_MULTI = (
+    "{0}coins/{1}?localization=false&tickers=false&market_data=true"
+    "&community_data=false&developer_data=false&sparkline=false"
+)
+API_ENDPOINT_PRICE_HISTORY = "{0}coins/{1}/market_chart?vs_currency={2}&days={3}"
 API_ENDPOINT_DOMINANCE = "{0}global"
 API_ENDPOINT_CHAIN_SUMMARY = "{0}explorer/api.dws?q=summary"
 API_ENDPOINT_CHAIN_ORPHANS = "{0}explorer/index.orphans.dws?coin={1}"
@@ -114,10 +186,79 @@ API_ENDPOINT_NOMP_POOL_STATS = "https://{0}/api/stats"
 API_ENDPOINT_MEMPOOL_STATS = "{0}mempool"
 API_ENDPOINT_MEMPOOL_FEES = "{0}v1/fees/recommended"
 API_ENDPOINT_MEMPOOL_NEXT_BLOCKS = "{0}v1/fees/mempool-blocks"
+API_ENDPOINT_MEMPOOL_TIP_HEIGHT = "{0}blocks/tip/height"
+API_ENDPOINT_CHAIN_TIP_HEIGHT = "{0}{1}/api.dws?q=getblockcount"
 
 DAY_SECONDS = 60 * 60 * 24
 
+DEFAULT_UNIT_OF_MEASUREMENT = "$"
 DEFAULT_MAX_FETCH_FAILURES = 3
+DEFAULT_DEADBAND_ABSOLUTE = 0.0
+DEFAULT_DEADBAND_RELATIVE = 0.0
+DEFAULT_MIN_WRITE_INTERVAL = 0.0
+DEFAULT_HISTORY_SIZE = 1440
+DEFAULT_HISTORY_DAYS = 30
+DEFAULT_INDICATOR_PERIOD = 20
+DEFAULT_RSI_PERIOD = 14
+DEFAULT_MEMPOOL_DEPTH_TARGET = 1.0
+DEFAULT_MEMPOOL_FEE_RATE_TARGET = 1.0
+MEMPOOL_VBYTES_PER_VMB = 1000000
+
+HTTP_SESSION_SHARED = "shared"
+HTTP_SESSION_DEDICATED = "dedicated"
+DEFAULT_HTTP_SESSION = HTTP_SESSION_SHARED
+DEFAULT_REQUEST_TIMEOUT = 30
+DEFAULT_HTTP_LIMIT_PER_HOST = 4
+DEFAULT_SHARED_FETCH_CONCURRENCY = 4
+DEFAULT_HTTP_DNS_CACHE_TTL = 300
+DEFAULT_HTTP_KEEPALIVE_TIMEOUT = 120
+
+DEFAULT_ADAPTIVE_MIN_FREQUENCY = 0.5
+DEFAULT_ADAPTIVE_MAX_FREQUENCY = 15.0
+DEFAULT_ADAPTIVE_THRESHOLD = 1.0
+ADAPTIVE_INTERVAL_SHRINK = 0.5
+ADAPTIVE_INTERVAL_GROWTH = 1.5
+# Requests per minute we allow ourselves against the free CoinGecko API
+API_RATE_BUDGET_COINGECKO = 10
+
+PROVIDER_COINGECKO = "coingecko"
+PROVIDER_CRYPTOID = "cryptoid"
+PROVIDER_MEMPOOL = "mempool"
+PROVIDER_BASE_URLS = {
+    PROVIDER_COINGECKO: API_BASE_URL_COINGECKO,
+    PROVIDER_CRYPTOID: API_BASE_URL_CRYPTOID,
+    PROVIDER_MEMPOOL: API_BASE_URL_MEMPOOLSPACE,
+}
+PROVIDER_RATE_BUDGETS = {
+    PROVIDER_COINGECKO: API_RATE_BUDGET_COINGECKO,
+}
+
+DEFAULT_BLOCK_GATING_MAX_STALENESS = 30.0
+DEFAULT_MAX_STALENESS = 60.0
+# Served data counts as stale once this many update intervals passed without a good fetch
+SERVE_STALE_EXPIRY_INTERVALS = 2
+DEFAULT_HEDGE_PERCENTILE = 95.0
+DEFAULT_LATENCY_SAMPLES = 200
+LATENCY_MIN_SAMPLES = 20
+LATENCY_REPORT_PERCENTILE = 95
+LATENCY_KEY_PRICE_MAIN = "price_main"
+LATENCY_KEY_PRICE_HEDGED = "price_main_hedged"
+DEFAULT_LOOP_MONITOR_THRESHOLD = 50.0
+DEFAULT_EXECUTOR_THRESHOLD = 65536
+LOOP_MONITOR_PROBE_SECONDS = 1
+LOOP_SECTION_DECODE = "decode"
+LOOP_SECTION_EXTRACT = "extract"
+LOOP_SECTION_PROPERTY_UPDATE = "property update"
+LOOP_SECTION_CHILD_FAN_OUT = "child fan-out"
+EVENT_SLOW_SECTION = f"{DOMAIN}_slow_section"
+TIP_HEIGHT_PROBE_SECONDS = 30
+
+TRAFFIC_MODE_OFF = "off"
+TRAFFIC_MODE_RECORD = "record"
+TRAFFIC_MODE_REPLAY = "replay"
+DEFAULT_TRAFFIC_MODE = TRAFFIC_MODE_OFF
+DEFAULT_TRAFFIC_FILE = "cryptoinfo_traffic.jsonl"
+DEFAULT_TRAFFIC_TIMING_SCALE = 1.0
 
 DEFAULT_CHAIN_DIFFICULTY_WINDOW = 2016
 DEFAULT_CHAIN_DIFF_MULTIPLIER = 4294967296
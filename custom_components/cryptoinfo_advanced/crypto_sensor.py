@@ -6,16 +6,22 @@ Author: TheHoliestRoger
 
 import aiohttp
 import asyncio
-import async_timeout
 import json
+import logging
 import time
 import traceback
+from contextlib import nullcontext
 from datetime import datetime, timedelta, timezone
 from dateutil import parser as dtparser
 
 from .const.const import (
     _LOGGER,
     CONF_EXTRA_SENSOR_PROPERTY,
+    CONF_DEADBAND_ABSOLUTE,
+    CONF_DEADBAND_RELATIVE,
+    CONF_MIN_WRITE_INTERVAL,
+    CONF_EXTRA_SENSOR_WINDOW,
+    CONF_EXTRA_SENSOR_TARGET,
     SENSOR_PREFIX,
     ATTR_LAST_UPDATE,
     ATTR_24H_VOLUME,
@@ -78,11 +84,30 @@ from .const.const import (
     ATTR_MEMPOOL_TOTAL_FEE_CALC,
     ATTR_MEMPOOL_SIZE_CALC,
     ATTR_MEMPOOL_AVERAGE_FEE_PER_TX,
-    API_BASE_URL_COINGECKO,
-    API_BASE_URL_CRYPTOID,
-    API_BASE_URL_MEMPOOLSPACE,
+    ATTR_MEMPOOL_FEE_RATE_FOR_DEPTH,
+    ATTR_MEMPOOL_DEPTH_AHEAD_OF_FEE_RATE,
+    ATTR_EFFECTIVE_UPDATE_INTERVAL,
+    ATTR_DATA_CHANGED,
+    ATTR_DATA_STALE,
+    ATTR_ROLLING_MEAN,
+    ATTR_ROLLING_STDDEV,
+    ATTR_ROLLING_MIN,
+    ATTR_ROLLING_MAX,
+    ATTR_ROLLING_RATE_OF_CHANGE,
+    ATTR_ORPHANS_7D,
+    ATTR_ORPHANS_30D,
+    ATTR_ORPHAN_RATE_30D,
+    ATTR_PRICE_SMA,
+    ATTR_PRICE_EMA,
+    ATTR_PRICE_RSI,
+    ATTR_PRICE_BOLLINGER_UPPER,
+    ATTR_PRICE_BOLLINGER_LOWER,
+    ATTR_PRICE_REALISED_VOLATILITY,
+    PROVIDER_MEMPOOL,
     API_ENDPOINT_PRICE_MAIN,
     API_ENDPOINT_PRICE_ALT,
+    API_ENDPOINT_PRICE_HISTORY,
+    API_ENDPOINT_PRICE_MAIN_MULTI,
     API_ENDPOINT_DOMINANCE,
     API_ENDPOINT_CHAIN_SUMMARY,
     API_ENDPOINT_CHAIN_CONTROL,
@@ -92,6 +117,8 @@ from .const.const import (
     API_ENDPOINT_MEMPOOL_FEES,
     API_ENDPOINT_MEMPOOL_NEXT_BLOCKS,
     API_ENDPOINT_MEMPOOL_STATS,
+    API_ENDPOINT_MEMPOOL_TIP_HEIGHT,
+    API_ENDPOINT_CHAIN_TIP_HEIGHT,
     CONF_DIFF_MULTIPLIER,
     CONF_BLOCK_TIME_MINUTES,
     CONF_DIFFICULTY_WINDOW,
@@ -101,11 +128,44 @@ from .const.const import (
     DEFAULT_CHAIN_BLOCK_TIME_MINS,
     DEFAULT_CHAIN_HALVING_WINDOW,
     DEFAULT_MAX_FETCH_FAILURES,
+    DEFAULT_DEADBAND_ABSOLUTE,
+    DEFAULT_DEADBAND_RELATIVE,
+    DEFAULT_HISTORY_SIZE,
+    DEFAULT_HISTORY_DAYS,
+    DEFAULT_INDICATOR_PERIOD,
+    DEFAULT_RSI_PERIOD,
+    DEFAULT_REQUEST_TIMEOUT,
+    DEFAULT_ADAPTIVE_MIN_FREQUENCY,
+    DEFAULT_ADAPTIVE_MAX_FREQUENCY,
+    DEFAULT_ADAPTIVE_THRESHOLD,
+    ADAPTIVE_INTERVAL_SHRINK,
+    ADAPTIVE_INTERVAL_GROWTH,
+    DEFAULT_BLOCK_GATING_MAX_STALENESS,
+    DEFAULT_MAX_STALENESS,
+    SERVE_STALE_EXPIRY_INTERVALS,
+    DEFAULT_MEMPOOL_DEPTH_TARGET,
+    DEFAULT_MEMPOOL_FEE_RATE_TARGET,
+    MEMPOOL_VBYTES_PER_VMB,
+    DEFAULT_HEDGE_PERCENTILE,
+    LATENCY_REPORT_PERCENTILE,
+    LATENCY_KEY_PRICE_MAIN,
+    LATENCY_KEY_PRICE_HEDGED,
+    DEFAULT_EXECUTOR_THRESHOLD,
+    TIP_HEIGHT_PROBE_SECONDS,
+    LOOP_SECTION_DECODE,
+    LOOP_SECTION_EXTRACT,
+    LOOP_SECTION_PROPERTY_UPDATE,
+    LOOP_SECTION_CHILD_FAN_OUT,
     DAY_SECONDS,
     PROPERTY_POOL_CONTROL_REMAINING,
 )
 
+from .history import CryptoInfoAdvHistory, CryptoInfoAdvOrphanSeries
+from .indexes import CryptoInfoAdvPoolIndex, CryptoInfoAdvFeeHistogramIndex
+from .indicators import CryptoInfoAdvPriceSeries
+from .latency import async_hedged_call
 from .manager import CryptoInfoAdvEntityManager, CryptoInfoAdvDataFetchType
+from .monitor import timed_section
 from .utils import unit_to_multiplier, currency_to_multiplier
 
 from homeassistant.components.sensor import (
@@ -119,8 +179,9 @@ from homeassistant.const import (
     CONF_UNIQUE_ID,
     CONF_UNIT_OF_MEASUREMENT,
 )
+from homeassistant.core import callback
 from homeassistant.exceptions import TemplateError
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.event import TrackTemplate, async_track_template_result
 from homeassistant.helpers.template import Template
 from homeassistant.util import Throttle
 
@@ -148,14 +209,37 @@ class CryptoinfoAdvSensor(SensorEntity):
         difficulty_window="",
         halving_window="",
         max_fetch_failures=None,
+        deadband_absolute=None,
+        deadband_relative=None,
+        min_write_interval=None,
+        history_size=None,
+        history_days=None,
+        http_session=None,
+        request_timeout=None,
+        adaptive_polling=False,
+        adaptive_min_frequency=None,
+        adaptive_max_frequency=None,
+        adaptive_threshold=None,
+        block_gating=False,
+        block_gating_max_staleness=None,
+        currency_group=None,
+        executor_threshold=None,
+        serve_stale=False,
+        max_staleness=None,
+        hedge_requests=False,
+        hedge_percentile=None,
+        api_base_url=None,
         is_child_sensor=False,
     ):
         # Internal Properties
         self.hass = hass
-        self._session = async_get_clientsession(hass) if hass is not None else None
+        self._session = CryptoInfoAdvEntityManager.instance(hass).get_entity_session(hass, http_session)
+        self._request_timeout = float(request_timeout) if request_timeout is not None else DEFAULT_REQUEST_TIMEOUT
+        self._executor_threshold = int(executor_threshold) if executor_threshold is not None else DEFAULT_EXECUTOR_THRESHOLD
         self.data = None
         self.cryptocurrency_name = cryptocurrency_name
         self.currency_name = currency_name
+        self.currency_group = tuple(currency_group) if currency_group else (currency_name, )
         self.pool_prefixes = pool_prefix if isinstance(pool_prefix, list) else [pool_prefix]
         self.multiplier = multiplier
         self._diff_multiplier = int(diff_multiplier) if diff_multiplier.isdigit() else DEFAULT_CHAIN_DIFF_MULTIPLIER
@@ -165,22 +249,72 @@ class CryptoinfoAdvSensor(SensorEntity):
         self._halving_window = int(halving_window) if halving_window.isdigit() else DEFAULT_CHAIN_HALVING_WINDOW
         self._max_fetch_failures = int(max_fetch_failures) if max_fetch_failures is not None else DEFAULT_MAX_FETCH_FAILURES
         self._internal_id_name = id_name if id_name is not None else ""
-        self._fetch_type = CryptoInfoAdvEntityManager.instance().get_fetch_type_from_str(api_mode)
+        self._fetch_type = CryptoInfoAdvEntityManager.instance(self.hass).get_fetch_type_from_str(api_mode)
+        self._provider = CryptoInfoAdvEntityManager.instance(self.hass).get_fetch_type_provider(self._fetch_type, api_base_url)
         self._fetch_args = fetch_args if fetch_args and len(fetch_args) else None
+        self._fetch_args_template = Template(self._fetch_args, hass) if self._fetch_args and "{" in self._fetch_args else None
+        self._rendered_fetch_args = None
+        self._fetch_args_cache = dict()
         self._api_domain_name = api_domain_name if api_domain_name and len(api_domain_name) else None
         self._pool_name = pool_name if pool_name and len(pool_name) else None
         self._update_frequency = update_frequency if isinstance(update_frequency, timedelta) else timedelta(minutes=1)
         self._is_child_sensor = is_child_sensor
         self._child_sensors = list()
+        self._child_subscriptions = dict()
         self._child_sensor_config = extra_sensors
         self._fetch_failure_count = 0
+        self._adaptive_polling = bool(adaptive_polling) and (
+            self._fetch_type in CryptoInfoAdvEntityManager.instance(self.hass).fetch_price_types
+        )
+        self._adaptive_min_frequency = adaptive_min_frequency if isinstance(
+            adaptive_min_frequency, timedelta) else timedelta(minutes=DEFAULT_ADAPTIVE_MIN_FREQUENCY)
+        self._adaptive_max_frequency = adaptive_max_frequency if isinstance(
+            adaptive_max_frequency, timedelta) else timedelta(minutes=DEFAULT_ADAPTIVE_MAX_FREQUENCY)
+        self._adaptive_threshold = float(adaptive_threshold) if adaptive_threshold is not None else DEFAULT_ADAPTIVE_THRESHOLD
+        self._effective_update_interval = self._update_frequency
+        self._last_fetch_attempt = 0
+        self._last_observed_state = None
+        self._block_gating = bool(block_gating) and (
+            self._fetch_type in CryptoInfoAdvEntityManager.instance(self.hass).fetch_block_gated_types
+            and PROPERTY_POOL_CONTROL_REMAINING not in self.pool_prefixes
+        )
+        self._block_gating_max_staleness = block_gating_max_staleness if isinstance(
+            block_gating_max_staleness, timedelta) else timedelta(minutes=DEFAULT_BLOCK_GATING_MAX_STALENESS)
+        self._last_applied_fetch = None
+        self._serve_stale = bool(serve_stale) and not is_child_sensor
+        self._max_staleness = max_staleness if isinstance(
+            max_staleness, timedelta) else timedelta(minutes=DEFAULT_MAX_STALENESS)
+        self._last_good_fetch_time = None
+        self._serve_stale_since = time.time()
+        self._refresh_task = None
+        self._hedge_requests = bool(hedge_requests) and self._fetch_type == CryptoInfoAdvDataFetchType.PRICE_MAIN
+        self._hedge_percentile = float(hedge_percentile) if hedge_percentile is not None else DEFAULT_HEDGE_PERCENTILE
+        self._deadband_absolute = float(deadband_absolute) if deadband_absolute is not None else DEFAULT_DEADBAND_ABSOLUTE
+        self._deadband_relative = float(deadband_relative) if deadband_relative is not None else DEFAULT_DEADBAND_RELATIVE
+        self._min_write_interval = min_write_interval if isinstance(min_write_interval, timedelta) else timedelta(0)
+        self._last_state_write = 0
+        self._last_change_time = None
+        self._history_size = int(history_size) if history_size is not None else DEFAULT_HISTORY_SIZE
+        self._history = None
+        self._history_days = int(history_days) if history_days is not None else DEFAULT_HISTORY_DAYS
 
         # HASS Attributes
-        self.async_update = Throttle(update_frequency)(self._async_update)
+        if self._adaptive_polling:
+            self.async_update = self._async_adaptive_update
+        elif self._block_gating:
+            self.async_update = Throttle(
+                min(self._update_frequency, timedelta(seconds=TIP_HEIGHT_PROBE_SECONDS))
+            )(self._async_update)
+        else:
+            self.async_update = Throttle(update_frequency)(self._async_update)
+        if self._serve_stale:
+            self._async_refresh = self.async_update
+            self.async_update = self._async_serve_stale_update
         self._attr_unique_id = unique_id if unique_id is not None and len(unique_id) else self._build_unique_id()
         self._name = self._build_name()
         self._state = None
-        self._last_update = None
+        self._last_update_time = None
+        self._last_update_cache = (None, None)
         self._icon = "mdi:bitcoin"
         self._attr_device_class = self._build_device_class()
         self._attr_state_class = state_class or SensorStateClass.MEASUREMENT
@@ -204,6 +338,8 @@ class CryptoinfoAdvSensor(SensorEntity):
         self._image_url = None
         self._ath_date = None
         self._atl_date = None
+        self._ath_date_raw = None
+        self._atl_date_raw = None
         self._difficulty = None
         self._hashrate = None
         self._pool_control_1000b = None
@@ -215,6 +351,7 @@ class CryptoinfoAdvSensor(SensorEntity):
         self._blocks_orphaned = None
         self._mempool_tx_count = None
         self._mempool_total_fee = None
+        self._fee_histogram = None
         self._mempool_fees_fastest = None
         self._mempool_fees_30min = None
         self._mempool_fees_60min = None
@@ -247,10 +384,56 @@ class CryptoinfoAdvSensor(SensorEntity):
     def fetch_type(self):
         return self._fetch_type
 
+    @property
+    def provider(self):
+        return self._provider
+
+    @property
+    def loop_monitor(self):
+        return CryptoInfoAdvEntityManager.instance(self.hass).loop_monitor
+
+    @property
+    def last_update(self):
+        if self._last_update_time is None:
+            return None
+
+        # Only formatted when read, and at most once per minute
+        minute = int(self._last_update_time // 60)
+        if self._last_update_cache[0] != minute:
+            self._last_update_cache = (minute, datetime.fromtimestamp(self._last_update_time).strftime("%d-%m-%Y %H:%M"))
+
+        return self._last_update_cache[1]
+
+    def _monitor_section(self, section):
+        if self.loop_monitor is None:
+            return nullcontext()
+
+        return self.loop_monitor.section(self, section)
+
+    @property
+    def is_currency_group(self):
+        return len(self.currency_group) > 1
+
+    @property
+    def api_domain_name(self):
+        return self._api_domain_name
+
+    @property
+    def block_gating(self):
+        return self._block_gating
+
+    @property
+    def block_gating_max_staleness(self):
+        return self._block_gating_max_staleness
+
     @property
     def hashrate(self):
         return self._hashrate
 
+    @property
+    def pool_control_1000b(self):
+        return self._pool_control_1000b
+
     @property
     def name(self):
         return self._name
@@ -284,7 +467,10 @@ class CryptoinfoAdvSensor(SensorEntity):
         if self._difficulty is None:
             return None
 
-        best_hashrate = CryptoInfoAdvEntityManager.instance().get_best_hashrate(self.cryptocurrency_name)
+        best_hashrate = CryptoInfoAdvEntityManager.instance(self.hass).get_best_hashrate(self.cryptocurrency_name)
+        if not best_hashrate:
+            return None
+
         return (self._difficulty * self._diff_multiplier) / best_hashrate
 
     @property
@@ -320,7 +506,7 @@ class CryptoinfoAdvSensor(SensorEntity):
         if self.difficulty_retarget_seconds is None:
             return None
 
-        last_diff_timestamp = CryptoInfoAdvEntityManager.instance().get_block_time(self.cryptocurrency_name)
+        last_diff_timestamp = CryptoInfoAdvEntityManager.instance(self.hass).get_block_time(self.cryptocurrency_name)
         if last_diff_timestamp is None:
             return None
 
@@ -393,6 +579,22 @@ class CryptoinfoAdvSensor(SensorEntity):
 
         return int(self._mempool_total_fee / self._mempool_tx_count)
 
+    def mempool_fee_rate_for_depth(self, target):
+        if self._fee_histogram is None:
+            return None
+
+        vsize = (target if target is not None else DEFAULT_MEMPOOL_DEPTH_TARGET) * MEMPOOL_VBYTES_PER_VMB
+
+        return self._fee_histogram.fee_rate_for_depth(vsize)
+
+    def mempool_depth_ahead_of_fee_rate(self, target):
+        if self._fee_histogram is None:
+            return None
+
+        fee_rate = target if target is not None else DEFAULT_MEMPOOL_FEE_RATE_TARGET
+
+        return round(self._fee_histogram.depth_ahead_of_fee_rate(fee_rate) / MEMPOOL_VBYTES_PER_VMB, 4)
+
     def mempool_total_fee_calc(self, unit_of_measurement):
         if self._mempool_total_fee is None:
             return None
@@ -442,6 +644,108 @@ class CryptoinfoAdvSensor(SensorEntity):
 
         return date_diff.days
 
+    def _get_rolling_window(self, window):
+        if self._history is None:
+            return None
+
+        return self._history.get_window(window.total_seconds() if window is not None else None)
+
+    def rolling_mean(self, window):
+        rolling_window = self._get_rolling_window(window)
+        if rolling_window is None or rolling_window.mean is None:
+            return None
+
+        return round(rolling_window.mean, 4)
+
+    def rolling_stddev(self, window):
+        rolling_window = self._get_rolling_window(window)
+        if rolling_window is None or rolling_window.stddev is None:
+            return None
+
+        return round(rolling_window.stddev, 4)
+
+    def rolling_min(self, window):
+        rolling_window = self._get_rolling_window(window)
+        if rolling_window is None:
+            return None
+
+        return rolling_window.min
+
+    def rolling_max(self, window):
+        rolling_window = self._get_rolling_window(window)
+        if rolling_window is None:
+            return None
+
+        return rolling_window.max
+
+    def rolling_rate_of_change(self, window):
+        rolling_window = self._get_rolling_window(window)
+        if rolling_window is None or rolling_window.rate_of_change is None:
+            return None
+
+        return round(rolling_window.rate_of_change, 4)
+
+    @property
+    def price_series(self):
+        return CryptoInfoAdvEntityManager.instance(self.hass).get_price_series(self.cryptocurrency_name, self.currency_name)
+
+    def price_sma(self, window):
+        if self.price_series is None:
+            return None
+
+        value = self.price_series.sma(self.price_series.samples_for_minutes(window, DEFAULT_INDICATOR_PERIOD))
+        return round(value, 4) if value is not None else None
+
+    def price_ema(self, window):
+        if self.price_series is None:
+            return None
+
+        value = self.price_series.ema(self.price_series.samples_for_minutes(window, DEFAULT_INDICATOR_PERIOD))
+        return round(value, 4) if value is not None else None
+
+    def price_rsi(self, window):
+        if self.price_series is None:
+            return None
+
+        value = self.price_series.rsi(self.price_series.samples_for_minutes(window, DEFAULT_RSI_PERIOD))
+        return round(value, 2) if value is not None else None
+
+    def price_bollinger_bands(self, window):
+        if self.price_series is None:
+            return (None, None)
+
+        bands = self.price_series.bollinger_bands(self.price_series.samples_for_minutes(window, DEFAULT_INDICATOR_PERIOD))
+        return tuple(round(band, 4) for band in bands) if bands is not None else (None, None)
+
+    def price_realised_volatility(self, window):
+        if self.price_series is None:
+            return None
+
+        value = self.price_series.realised_volatility(self.price_series.samples_for_minutes(window, self.price_series.count))
+        return round(value, 2) if value is not None else None
+
+    @property
+    def orphans_7d(self):
+        if not isinstance(self.data, CryptoInfoAdvOrphanSeries):
+            return None
+
+        return self.data.orphans_in_days(7)
+
+    @property
+    def orphans_30d(self):
+        if not isinstance(self.data, CryptoInfoAdvOrphanSeries):
+            return None
+
+        return self.data.orphans_in_days(30)
+
+    @property
+    def orphan_rate_30d(self):
+        if self.orphans_30d is None:
+            return None
+
+        expected_blocks = (30 * DAY_SECONDS) / (self._block_time_minutes * 60)
+        return round((self.orphans_30d / expected_blocks) * 100, 4)
+
     @property
     def pool_control_1000b_perc(self):
         if self._pool_control_1000b is None:
@@ -451,14 +755,24 @@ class CryptoinfoAdvSensor(SensorEntity):
 
     def get_extra_state_attrs(self, full_attr_force=False):
         output_attrs = {
-            ATTR_LAST_UPDATE: self._last_update,
+            ATTR_LAST_UPDATE: self.last_update,
         }
 
-        if full_attr_force or self._fetch_type in CryptoInfoAdvEntityManager.instance().fetch_price_types:
+        if self._adaptive_polling:
+            output_attrs[ATTR_EFFECTIVE_UPDATE_INTERVAL] = int(self._effective_update_interval.total_seconds())
+
+        if self._serve_stale:
+            output_attrs[ATTR_DATA_CHANGED] = self.data_changed
+            output_attrs[ATTR_DATA_STALE] = self.is_stale
+
+        if full_attr_force or self._fetch_type in CryptoInfoAdvEntityManager.instance(self.hass).fetch_price_types:
             output_attrs[ATTR_BASE_PRICE] = self._base_price
             output_attrs[ATTR_24H_VOLUME] = self._24h_volume
             output_attrs[ATTR_24H_CHANGE] = self._24h_change
 
+        if full_attr_force or self._fetch_type == CryptoInfoAdvDataFetchType.PRICE_HISTORY:
+            output_attrs[ATTR_BASE_PRICE] = self._base_price
+
         if full_attr_force or self._fetch_type == CryptoInfoAdvDataFetchType.PRICE_MAIN:
             output_attrs[ATTR_1H_CHANGE] = self._1h_change
             output_attrs[ATTR_7D_CHANGE] = self._7d_change
@@ -473,13 +787,13 @@ class CryptoinfoAdvSensor(SensorEntity):
             output_attrs[ATTR_ALL_TIME_HIGH_DATE] = self._ath_date
             output_attrs[ATTR_ALL_TIME_LOW_DATE] = self._atl_date
 
-        if full_attr_force or self._fetch_type in CryptoInfoAdvEntityManager.instance().fetch_supply_types:
+        if full_attr_force or self._fetch_type in CryptoInfoAdvEntityManager.instance(self.hass).fetch_supply_types:
             output_attrs[ATTR_CIRCULATING_SUPPLY] = self._circulating_supply
 
-        if full_attr_force or self._fetch_type in CryptoInfoAdvEntityManager.instance().fetch_market_cap_types:
+        if full_attr_force or self._fetch_type in CryptoInfoAdvEntityManager.instance(self.hass).fetch_market_cap_types:
             output_attrs[ATTR_MARKET_CAP] = self._market_cap
 
-        if full_attr_force or self._fetch_type in CryptoInfoAdvEntityManager.instance().fetch_block_height_types:
+        if full_attr_force or self._fetch_type in CryptoInfoAdvEntityManager.instance(self.hass).fetch_block_height_types:
             output_attrs[ATTR_BLOCK_HEIGHT] = self._block_height
 
         if full_attr_force or self._fetch_type == CryptoInfoAdvDataFetchType.CHAIN_SUMMARY:
@@ -565,7 +879,7 @@ class CryptoinfoAdvSensor(SensorEntity):
             if child_sensor is None or child_sensor.attribute_key == ATTR_TOTAL_HALVINGS_TO_DATE:
                 output_attrs[ATTR_TOTAL_HALVINGS_TO_DATE] = self.total_halvings_to_date
 
-        if full_attr_force or self._fetch_type in CryptoInfoAdvEntityManager.instance().fetch_hashrate_types:
+        if full_attr_force or self._fetch_type in CryptoInfoAdvEntityManager.instance(self.hass).fetch_hashrate_types:
 
             if child_sensor is None or child_sensor.attribute_key == ATTR_HASHRATE_CALC:
                 output_attrs[ATTR_HASHRATE_CALC] = self.hashrate_calc(
@@ -587,6 +901,14 @@ class CryptoinfoAdvSensor(SensorEntity):
             if child_sensor is None or child_sensor.attribute_key == ATTR_MEMPOOL_AVERAGE_FEE_PER_TX:
                 output_attrs[ATTR_MEMPOOL_AVERAGE_FEE_PER_TX] = self.mempool_average_fee_per_tx
 
+            target = child_sensor.target if child_sensor is not None else None
+
+            if child_sensor is None or child_sensor.attribute_key == ATTR_MEMPOOL_FEE_RATE_FOR_DEPTH:
+                output_attrs[ATTR_MEMPOOL_FEE_RATE_FOR_DEPTH] = self.mempool_fee_rate_for_depth(target)
+
+            if child_sensor is None or child_sensor.attribute_key == ATTR_MEMPOOL_DEPTH_AHEAD_OF_FEE_RATE:
+                output_attrs[ATTR_MEMPOOL_DEPTH_AHEAD_OF_FEE_RATE] = self.mempool_depth_ahead_of_fee_rate(target)
+
         if full_attr_force or self._fetch_type == CryptoInfoAdvDataFetchType.MEMPOOL_NEXT_BLOCK:
 
             if child_sensor is None or child_sensor.attribute_key == ATTR_MEMPOOL_NEXT_BLOCK_SIZE_CALC:
@@ -620,6 +942,55 @@ class CryptoinfoAdvSensor(SensorEntity):
             if child_sensor is None or child_sensor.attribute_key == ATTR_POOL_CONTROL_1000B_PERC:
                 output_attrs[ATTR_POOL_CONTROL_1000B_PERC] = self.pool_control_1000b_perc
 
+        if full_attr_force or self._fetch_type == CryptoInfoAdvDataFetchType.CHAIN_ORPHANS:
+
+            if child_sensor is None or child_sensor.attribute_key == ATTR_ORPHANS_7D:
+                output_attrs[ATTR_ORPHANS_7D] = self.orphans_7d
+
+            if child_sensor is None or child_sensor.attribute_key == ATTR_ORPHANS_30D:
+                output_attrs[ATTR_ORPHANS_30D] = self.orphans_30d
+
+            if child_sensor is None or child_sensor.attribute_key == ATTR_ORPHAN_RATE_30D:
+                output_attrs[ATTR_ORPHAN_RATE_30D] = self.orphan_rate_30d
+
+        if full_attr_force or self._fetch_type == CryptoInfoAdvDataFetchType.PRICE_HISTORY:
+            window = child_sensor.window.total_seconds() / 60 if child_sensor is not None and child_sensor.window else None
+
+            if child_sensor is None or child_sensor.attribute_key == ATTR_PRICE_SMA:
+                output_attrs[ATTR_PRICE_SMA] = self.price_sma(window)
+
+            if child_sensor is None or child_sensor.attribute_key == ATTR_PRICE_EMA:
+                output_attrs[ATTR_PRICE_EMA] = self.price_ema(window)
+
+            if child_sensor is None or child_sensor.attribute_key == ATTR_PRICE_RSI:
+                output_attrs[ATTR_PRICE_RSI] = self.price_rsi(window)
+
+            if child_sensor is None or child_sensor.attribute_key in [ATTR_PRICE_BOLLINGER_UPPER, ATTR_PRICE_BOLLINGER_LOWER]:
+                (bollinger_upper, bollinger_lower) = self.price_bollinger_bands(window)
+                output_attrs[ATTR_PRICE_BOLLINGER_UPPER] = bollinger_upper
+                output_attrs[ATTR_PRICE_BOLLINGER_LOWER] = bollinger_lower
+
+            if child_sensor is None or child_sensor.attribute_key == ATTR_PRICE_REALISED_VOLATILITY:
+                output_attrs[ATTR_PRICE_REALISED_VOLATILITY] = self.price_realised_volatility(window)
+
+        if full_attr_force or self._history is not None:
+            window = child_sensor.window if child_sensor is not None else None
+
+            if child_sensor is None or child_sensor.attribute_key == ATTR_ROLLING_MEAN:
+                output_attrs[ATTR_ROLLING_MEAN] = self.rolling_mean(window)
+
+            if child_sensor is None or child_sensor.attribute_key == ATTR_ROLLING_STDDEV:
+                output_attrs[ATTR_ROLLING_STDDEV] = self.rolling_stddev(window)
+
+            if child_sensor is None or child_sensor.attribute_key == ATTR_ROLLING_MIN:
+                output_attrs[ATTR_ROLLING_MIN] = self.rolling_min(window)
+
+            if child_sensor is None or child_sensor.attribute_key == ATTR_ROLLING_MAX:
+                output_attrs[ATTR_ROLLING_MAX] = self.rolling_max(window)
+
+            if child_sensor is None or child_sensor.attribute_key == ATTR_ROLLING_RATE_OF_CHANGE:
+                output_attrs[ATTR_ROLLING_RATE_OF_CHANGE] = self.rolling_rate_of_change(window)
+
         return output_attrs
 
     @property
@@ -634,6 +1005,16 @@ class CryptoinfoAdvSensor(SensorEntity):
 
         return keys
 
+    @property
+    def rolling_extra_sensor_keys(self):
+        return [
+            ATTR_ROLLING_MEAN,
+            ATTR_ROLLING_STDDEV,
+            ATTR_ROLLING_MIN,
+            ATTR_ROLLING_MAX,
+            ATTR_ROLLING_RATE_OF_CHANGE,
+        ]
+
     @property
     def extra_sensor_attributes(self):
         return self.get_extra_sensor_attrs()
@@ -645,7 +1026,7 @@ class CryptoinfoAdvSensor(SensorEntity):
         return base_keys[:]
 
     def _build_name(self):
-        if self._fetch_type not in CryptoInfoAdvEntityManager.instance().fetch_price_types:
+        if self._fetch_type not in CryptoInfoAdvEntityManager.instance(self.hass).fetch_price_types:
             return (
                 SENSOR_PREFIX
                 + (self._internal_id_name if len(self._internal_id_name) > 0 else (
@@ -666,9 +1047,11 @@ class CryptoinfoAdvSensor(SensorEntity):
         return "".join(self.pool_prefixes)
 
     def _build_unique_id(self):
-        if self._fetch_type not in CryptoInfoAdvEntityManager.instance().fetch_price_types:
+        if self._fetch_type not in CryptoInfoAdvEntityManager.instance(self.hass).fetch_price_types:
             if self._fetch_type == CryptoInfoAdvDataFetchType.CHAIN_CONTROL:
                 id_slug = f"{self._fetch_type.id_slug}_{self.pool_prefix_id}"
+            elif self._fetch_type == CryptoInfoAdvDataFetchType.PRICE_HISTORY:
+                id_slug = f"{self._fetch_type.id_slug}_{self.currency_name}"
             else:
                 id_slug = f"{self._fetch_type.id_slug}"
             return "{0}{1}{2}_{3}".format(
@@ -681,10 +1064,10 @@ class CryptoinfoAdvSensor(SensorEntity):
             )
 
     def _build_device_class(self):
-        if self._fetch_type in CryptoInfoAdvEntityManager.instance().fetch_price_types:
+        if self._fetch_type in CryptoInfoAdvEntityManager.instance(self.hass).fetch_price_types:
             return SensorDeviceClass.MONETARY
 
-        elif self._fetch_type in CryptoInfoAdvEntityManager.instance().fetch_time_types:
+        elif self._fetch_type in CryptoInfoAdvEntityManager.instance(self.hass).fetch_time_types:
             return SensorDeviceClass.DURATION
 
         else:
@@ -709,7 +1092,7 @@ class CryptoinfoAdvSensor(SensorEntity):
 
                 return False
 
-        if self._fetch_type in CryptoInfoAdvEntityManager.instance().fetch_mempool_types:
+        if self._fetch_type in CryptoInfoAdvEntityManager.instance(self.hass).fetch_mempool_types:
 
             if self.cryptocurrency_name.lower() not in ['btc', 'bitcoin']:
                 _LOGGER.error(f"Sensor {self.name} is not BTC, mempool is only supported for BTC.")
@@ -728,15 +1111,24 @@ class CryptoinfoAdvSensor(SensorEntity):
         )
         _LOGGER.error(tb)
 
-    async def _async_api_fetch(self, api_data, url, extract_data, extract_primary, encoding="utf-8"):
+    async def _async_api_fetch(self, api_data, url, extract_data, extract_primary, encoding="utf-8", resp_text=None):
         try:
             if api_data is None:
-                async with async_timeout.timeout(30):
-                    response = await self._session.get(url)
-                    if response.status == 200:
-                        resp_text = await response.text(encoding=encoding)
-                        api_data = extract_data(json.loads(resp_text))
-            primary_data = extract_primary(api_data)
+                if resp_text is None:
+                    resp_text = await self._async_api_get_limited(url, encoding)
+
+                if resp_text is not None and self.hass is not None and len(resp_text) > self._executor_threshold:
+                    api_data = await self._async_extract_in_executor(resp_text, extract_data)
+
+                elif resp_text is not None:
+                    with self._monitor_section(LOOP_SECTION_DECODE):
+                        json_data = json.loads(resp_text)
+
+                    with self._monitor_section(LOOP_SECTION_EXTRACT):
+                        api_data = extract_data(json_data)
+
+            with self._monitor_section(LOOP_SECTION_EXTRACT):
+                primary_data = extract_primary(api_data)
             self.data = api_data
         except asyncio.TimeoutError:
             _LOGGER.error("Timeout fetching update for %s", self.name)
@@ -753,11 +1145,80 @@ class CryptoinfoAdvSensor(SensorEntity):
 
         return primary_data, api_data
 
+    @staticmethod
+    def _decode_and_extract(resp_text, extract_data):
+        return extract_data(json.loads(resp_text))
+
+    async def _async_extract_in_executor(self, resp_text, extract_data):
+        if self._fetch_type in CryptoInfoAdvEntityManager.instance(self.hass).fetch_executor_unsafe_types:
+            json_data = await self.hass.async_add_executor_job(json.loads, resp_text)
+
+            with self._monitor_section(LOOP_SECTION_EXTRACT):
+                return extract_data(json_data)
+
+        return await self.hass.async_add_executor_job(self._decode_and_extract, resp_text, extract_data)
+
+    async def _async_api_get_limited(self, url, encoding="utf-8"):
+        if not CryptoInfoAdvEntityManager.instance(self.hass).is_shared_entity(self):
+            return await self._async_api_get(url, encoding)
+
+        async with CryptoInfoAdvEntityManager.instance(self.hass).fetch_semaphore:
+            return await self._async_api_get(url, encoding)
+
+    async def _async_api_get(self, url, encoding="utf-8", provider=None):
+        return await CryptoInfoAdvEntityManager.instance(self.hass).async_api_get(
+            self._session, url, self._request_timeout, provider or self._provider, encoding
+        )
+
+    async def _async_probe_tip_height(self):
+        if not CryptoInfoAdvEntityManager.instance(self.hass).should_probe_tip_height(self.cryptocurrency_name):
+            return
+
+        provider = CryptoInfoAdvEntityManager.instance(self.hass).get_tip_height_provider(self)
+
+        if provider.name == PROVIDER_MEMPOOL:
+            url = provider.build_url(API_ENDPOINT_MEMPOOL_TIP_HEIGHT)
+        else:
+            url = provider.build_url(API_ENDPOINT_CHAIN_TIP_HEIGHT, self.cryptocurrency_name)
+
+        try:
+            resp_text = await self._async_api_get(url, encoding="latin-1", provider=provider)
+            if resp_text is not None:
+                CryptoInfoAdvEntityManager.instance(self.hass).set_tip_height(self.cryptocurrency_name, int(resp_text))
+        except (asyncio.TimeoutError, aiohttp.ClientError, ValueError) as err:
+            _LOGGER.debug("Error probing tip height for %s: %r", self.name, err)
+
     def _extract_data_price_main_primary(self, api_data):
-        return api_data["current_price"] * float(self.multiplier)
+        return self._extract_data_price_main_special(api_data)["current_price"] * float(self.multiplier)
 
     def _extract_data_price_main_full(self, json_data):
-        return json_data[0]
+        if not self.is_currency_group:
+            return json_data[0]
+
+        market_data = json_data["market_data"]
+        currency_keys = [
+            "current_price", "total_volume", "market_cap", "ath", "atl", "low_24h", "high_24h", "ath_date", "atl_date",
+            "price_change_percentage_1h_in_currency", "price_change_percentage_24h_in_currency",
+            "price_change_percentage_7d_in_currency", "price_change_percentage_30d_in_currency",
+        ]
+
+        return {
+            "market_data": {
+                currency: {
+                    **{k: (market_data.get(k) or {}).get(currency) for k in currency_keys},
+                    "circulating_supply": market_data.get("circulating_supply"),
+                    "total_supply": market_data.get("total_supply"),
+                    "image": (json_data.get("image") or {}).get("large"),
+                }
+                for currency in self.currency_group
+            }
+        }
+
+    def _extract_data_price_main_special(self, api_data):
+        if not self.is_currency_group:
+            return api_data
+
+        return api_data["market_data"][self.currency_name]
 
     def _extract_data_price_simple_primary(self, api_data):
         return api_data[self.currency_name] * float(self.multiplier)
@@ -765,6 +1226,15 @@ class CryptoinfoAdvSensor(SensorEntity):
     def _extract_data_price_simple_full(self, json_data):
         return json_data[self.cryptocurrency_name]
 
+    def _extract_data_price_history_primary(self, api_data):
+        return api_data.last_price * float(self.multiplier)
+
+    def _extract_data_price_history_full(self, json_data):
+        price_series = CryptoInfoAdvPriceSeries.from_market_chart(json_data)
+        CryptoInfoAdvEntityManager.instance(self.hass).set_price_series(self.cryptocurrency_name, self.currency_name, price_series)
+
+        return price_series
+
     def _extract_data_dominance_primary(self, api_data):
         return float(api_data["market_cap_percentage"][self.cryptocurrency_name])
 
@@ -780,21 +1250,19 @@ class CryptoinfoAdvSensor(SensorEntity):
     def _extract_data_chain_control_primary(self, api_data):
         return True
 
-    def _extract_data_chain_control_special(self, json_data, ignore_not_found=True):
-        pool_data = None
+    def _extract_data_chain_control_special(self, pool_index, ignore_not_found=True):
+        pools_found = 0
         data_100_blk = 0
         data_1000_blk = 0
         for pool_prefix in self.pool_prefixes:
             if pool_prefix is not None and len(pool_prefix):
-                for pool in json_data["pools"]:
-                    if pool["name"].lower().startswith(pool_prefix.lower()):
-                        pool_data = pool
-                        data_100_blk += pool["nb100"]
-                        data_1000_blk += pool["nb1000"]
+                (prefix_pools, prefix_100_blk, prefix_1000_blk) = pool_index.lookup(pool_prefix)
+                pools_found += prefix_pools
+                data_100_blk += prefix_100_blk
+                data_1000_blk += prefix_1000_blk
 
-        if ignore_not_found or pool_data is not None:
+        if ignore_not_found or pools_found > 0:
             return {
-                **(pool_data if pool_data is not None else {}),
                 "nb100": data_100_blk,
                 "nb1000": data_1000_blk,
             }
@@ -802,21 +1270,21 @@ class CryptoinfoAdvSensor(SensorEntity):
         return None
 
     def _extract_data_chain_control_full(self, json_data):
-        if self._extract_data_chain_control_special(json_data, ignore_not_found=False) is None:
+        pool_index = CryptoInfoAdvPoolIndex(json_data["pools"])
+
+        if self._extract_data_chain_control_special(pool_index, ignore_not_found=False) is None:
             _LOGGER.debug(f"Pool Prefixes {self.pool_prefixes} not found")
 
-        return json_data
+        return pool_index
 
     def _extract_data_chain_orphans_primary(self, api_data):
-        orphans_start_timestamp = api_data["d"] * DAY_SECONDS
-        last_orphan_timestamp = (len(api_data["n"]) * DAY_SECONDS) + orphans_start_timestamp
-        last_orphan_date = datetime.fromtimestamp(last_orphan_timestamp).date()
-        today_date = datetime.now().date()
-        orphans_today = api_data["n"][-1] if today_date == last_orphan_date else 0
-        return orphans_today
+        return api_data.orphans_today
 
     def _extract_data_chain_orphans_full(self, json_data):
-        return json_data
+        orphan_series = CryptoInfoAdvEntityManager.instance(self.hass).get_orphan_series(self.cryptocurrency_name)
+        orphan_series.merge(json_data["d"], json_data["n"])
+
+        return orphan_series
 
     def _extract_data_chain_block_time_primary(self, api_data):
         return int(api_data)
@@ -825,24 +1293,34 @@ class CryptoinfoAdvSensor(SensorEntity):
         return json_data
 
     def _extract_data_nomp_pool_stats_full(self, json_data):
+        return json_data["pools"]
+
+    def _extract_data_nomp_pool_stats_special(self, pools_data):
+        if self._pool_name not in pools_data:
+            _LOGGER.debug(f"Pool {self._pool_name} not found on {self._api_domain_name}")
+            return None
+
         pool_data = {
-            **json_data["pools"][self._pool_name],
-            **json_data["pools"][self._pool_name]["poolStats"],
-            "blocks_pending": json_data["pools"][self._pool_name]["blocks"]["pending"],
-            "blocks_confirmed": json_data["pools"][self._pool_name]["blocks"]["confirmed"],
-            "blocks_orphaned": json_data["pools"][self._pool_name]["blocks"]["orphaned"],
+            **pools_data[self._pool_name],
+            **pools_data[self._pool_name]["poolStats"],
+            "blocks_pending": pools_data[self._pool_name]["blocks"]["pending"],
+            "blocks_confirmed": pools_data[self._pool_name]["blocks"]["confirmed"],
+            "blocks_orphaned": pools_data[self._pool_name]["blocks"]["orphaned"],
         }
 
         for k in ["blocks", "workers", "poolFees", "poolStats"]:
-            del pool_data[k]
+            pool_data.pop(k, None)
 
         return pool_data
 
     def _extract_data_nomp_pool_stats_primary(self, api_data):
-        return float(api_data["hashrate"])
+        return self._pool_name in api_data
 
     def _extract_data_mempool_stats_full(self, json_data):
-        return json_data
+        return {
+            **json_data,
+            "fee_histogram": CryptoInfoAdvFeeHistogramIndex(json_data.get("fee_histogram") or []),
+        }
 
     def _extract_data_mempool_stats_primary(self, api_data):
         return int(api_data["vsize"])
@@ -865,17 +1343,93 @@ class CryptoinfoAdvSensor(SensorEntity):
 
         return None
 
-    async def _fetch_price_data_main(self, api_data=None):
+    def _build_price_main_url(self):
+        if self.is_currency_group:
+            return self._provider.build_url(API_ENDPOINT_PRICE_MAIN_MULTI, self.cryptocurrency_name)
+
+        return self._provider.build_url(API_ENDPOINT_PRICE_MAIN, self.cryptocurrency_name, self.currency_name)
+
+    def _build_price_alternate_url(self):
+        return self._provider.build_url(API_ENDPOINT_PRICE_ALT, self.cryptocurrency_name, ",".join(self.currency_group))
+
+    async def _async_hedge_get(self, url):
+        try:
+            return await self._async_api_get_limited(url)
+        except asyncio.TimeoutError:
+            _LOGGER.error("Timeout fetching update for %s", self.name)
+        except aiohttp.ClientError as err:
+            _LOGGER.error("Error fetching update for %s: %r", self.name, err)
+        except Exception as error:
+            self._log_api_error(error, traceback.format_exc())
+
+        return None
+
+    async def _fetch_price_data_hedged(self, api_data=None):
+        if api_data is not None:
+            return await self._fetch_price_data_main(api_data)
+
+        # The simple endpoint is raced against the markets endpoint once it is slower than usual
+        manager = CryptoInfoAdvEntityManager.instance(self.hass)
+        primary_tracker = manager.get_latency_tracker(LATENCY_KEY_PRICE_MAIN)
+        start = time.perf_counter()
+
+        (used_alternate, resp_text) = await async_hedged_call(
+            lambda: self._async_hedge_get(self._build_price_main_url()),
+            lambda: self._async_hedge_get(self._build_price_alternate_url()),
+            primary_tracker.percentile(self._hedge_percentile),
+            primary_tracker=primary_tracker,
+            allow_hedge=self._provider.has_rate_budget,
+        )
+
+        if resp_text is not None:
+            manager.get_latency_tracker(LATENCY_KEY_PRICE_HEDGED).add(time.perf_counter() - start)
+
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug(
+                "Price latency p%s for %s: markets endpoint %s ms, hedged %s ms",
+                LATENCY_REPORT_PERCENTILE,
+                self.name,
+                primary_tracker.percentile_ms(LATENCY_REPORT_PERCENTILE),
+                manager.get_latency_tracker(LATENCY_KEY_PRICE_HEDGED).percentile_ms(LATENCY_REPORT_PERCENTILE),
+            )
+
+        if resp_text is None and used_alternate:
+            # Both endpoints were tried already, no need for the regular fallback
+            self._process_failed_fetch()
+            return None
+
+        if used_alternate:
+            return await self._fetch_price_data_alternate(resp_text=resp_text)
+
+        if resp_text is None:
+            raise ValueError()
+
+        return await self._fetch_price_data_main(resp_text=resp_text)
+
+    async def _fetch_price_data_main(self, api_data=None, resp_text=None):
         if not self._fetch_type == CryptoInfoAdvDataFetchType.PRICE_MAIN:
             raise ValueError()
 
+        if self.is_currency_group and api_data is not None and "market_data" not in api_data:
+            # Cached by the simple endpoint fallback
+            raise ValueError()
+
         price_data, api_data = await self._async_api_fetch(
             api_data,
-            API_ENDPOINT_PRICE_MAIN.format(API_BASE_URL_COINGECKO, self.cryptocurrency_name, self.currency_name),
-            self._extract_data_price_main_full, self._extract_data_price_main_primary
+            self._build_price_main_url(),
+            self._extract_data_price_main_full, self._extract_data_price_main_primary,
+            resp_text=resp_text,
         )
 
         if price_data is not None:
+            api_data = self._extract_data_price_main_special(api_data)
+            CryptoInfoAdvEntityManager.instance(self.hass).append_price_history(
+                self.cryptocurrency_name, self.currency_name, api_data["current_price"]
+            )
+            CryptoInfoAdvEntityManager.instance(self.hass).set_latest_price(
+                self.cryptocurrency_name, self.currency_name, api_data["current_price"]
+            )
+
             self._update_all_properties(
                 state=float(price_data),
                 base_price=api_data["current_price"],
@@ -901,17 +1455,28 @@ class CryptoinfoAdvSensor(SensorEntity):
 
         return self.data
 
-    async def _fetch_price_data_alternate(self, api_data=None):
-        if self._fetch_type not in CryptoInfoAdvEntityManager.instance().fetch_price_types:
+    async def _fetch_price_data_alternate(self, api_data=None, resp_text=None):
+        if self._fetch_type not in CryptoInfoAdvEntityManager.instance(self.hass).fetch_price_types:
             raise ValueError()
 
+        if api_data is not None and "market_data" in api_data:
+            api_data = None
+
         price_data, api_data = await self._async_api_fetch(
             api_data,
-            API_ENDPOINT_PRICE_ALT.format(API_BASE_URL_COINGECKO, self.cryptocurrency_name, self.currency_name),
-            self._extract_data_price_simple_full, self._extract_data_price_simple_primary
+            self._build_price_alternate_url(),
+            self._extract_data_price_simple_full, self._extract_data_price_simple_primary,
+            resp_text=resp_text,
         )
 
         if price_data is not None:
+            CryptoInfoAdvEntityManager.instance(self.hass).append_price_history(
+                self.cryptocurrency_name, self.currency_name, api_data[self.currency_name]
+            )
+            CryptoInfoAdvEntityManager.instance(self.hass).set_latest_price(
+                self.cryptocurrency_name, self.currency_name, api_data[self.currency_name]
+            )
+
             self._update_all_properties(
                 state=float(price_data),
                 base_price=api_data[self.currency_name],
@@ -925,10 +1490,31 @@ class CryptoinfoAdvSensor(SensorEntity):
 
         return self.data
 
+    async def _fetch_price_history(self, api_data=None):
+        history_data, api_data = await self._async_api_fetch(
+            api_data,
+            self._provider.build_url(
+                API_ENDPOINT_PRICE_HISTORY, self.cryptocurrency_name, self.currency_name, self._history_days
+            ),
+            self._extract_data_price_history_full,
+            self._extract_data_price_history_primary
+        )
+
+        if history_data is not None:
+            self._update_all_properties(
+                state=float(history_data),
+                base_price=api_data.last_price,
+            )
+
+        else:
+            raise ValueError()
+
+        return self.data
+
     async def _fetch_dominance(self, api_data=None):
         dominance_data, api_data = await self._async_api_fetch(
             api_data,
-            API_ENDPOINT_DOMINANCE.format(API_BASE_URL_COINGECKO),
+            self._provider.build_url(API_ENDPOINT_DOMINANCE),
             self._extract_data_dominance_full,
             self._extract_data_dominance_primary
         )
@@ -947,7 +1533,7 @@ class CryptoinfoAdvSensor(SensorEntity):
     async def _fetch_chain_summary(self, api_data=None):
         summary_data, api_data = await self._async_api_fetch(
             api_data,
-            API_ENDPOINT_CHAIN_SUMMARY.format(API_BASE_URL_CRYPTOID),
+            self._provider.build_url(API_ENDPOINT_CHAIN_SUMMARY),
             self._extract_data_chain_summary_full,
             self._extract_data_chain_summary_primary,
             encoding="latin-1"
@@ -966,21 +1552,24 @@ class CryptoinfoAdvSensor(SensorEntity):
 
         return self.data
 
+    def _update_remaining_hash_control(self):
+        (remaining_control_100, remaining_control_1000) = CryptoInfoAdvEntityManager.instance(
+            self.hass).get_remaining_hash_control(self.cryptocurrency_name)
+
+        self._update_all_properties(
+            state=remaining_control_100,
+            pool_control_1000b=remaining_control_1000,
+        )
+
     async def _fetch_chain_control(self, api_data=None):
         if len(self.pool_prefixes) == 1 and PROPERTY_POOL_CONTROL_REMAINING in self.pool_prefixes:
-            (remaining_control_100, remaining_control_1000) = CryptoInfoAdvEntityManager.instance(
-            ).get_remaining_hash_control(self.cryptocurrency_name)
-
-            self._update_all_properties(
-                state=remaining_control_100,
-                pool_control_1000b=remaining_control_1000,
-            )
+            self._update_remaining_hash_control()
 
             return self.data
 
         control_data, api_data = await self._async_api_fetch(
             api_data,
-            API_ENDPOINT_CHAIN_CONTROL.format(API_BASE_URL_CRYPTOID, self.cryptocurrency_name),
+            self._provider.build_url(API_ENDPOINT_CHAIN_CONTROL, self.cryptocurrency_name),
             self._extract_data_chain_control_full,
             self._extract_data_chain_control_primary,
             encoding="latin-1"
@@ -1005,7 +1594,7 @@ class CryptoinfoAdvSensor(SensorEntity):
     async def _fetch_chain_orphans(self, api_data=None):
         orphans_data, api_data = await self._async_api_fetch(
             api_data,
-            API_ENDPOINT_CHAIN_ORPHANS.format(API_BASE_URL_CRYPTOID, self.cryptocurrency_name),
+            self._provider.build_url(API_ENDPOINT_CHAIN_ORPHANS, self.cryptocurrency_name),
             self._extract_data_chain_orphans_full,
             self._extract_data_chain_orphans_primary,
             encoding="latin-1"
@@ -1027,7 +1616,7 @@ class CryptoinfoAdvSensor(SensorEntity):
         try:
             block_height = int(block_height_arg)
         except Exception:
-            block_height = CryptoInfoAdvEntityManager.instance().get_last_diff(self.cryptocurrency_name)
+            block_height = CryptoInfoAdvEntityManager.instance(self.hass).get_last_diff(self.cryptocurrency_name)
 
             if block_height_arg is not None:
                 _LOGGER.warning("Error fetching " + self.name + " - Invalid block height arg supplied.")
@@ -1042,7 +1631,7 @@ class CryptoinfoAdvSensor(SensorEntity):
 
         block_time_data, api_data = await self._async_api_fetch(
             api_data,
-            API_ENDPOINT_CHAIN_BLOCK_TIME.format(API_BASE_URL_CRYPTOID, self.cryptocurrency_name, block_height),
+            self._provider.build_url(API_ENDPOINT_CHAIN_BLOCK_TIME, self.cryptocurrency_name, block_height),
             self._extract_data_chain_block_time_full,
             self._extract_data_chain_block_time_primary,
             encoding="latin-1"
@@ -1062,23 +1651,26 @@ class CryptoinfoAdvSensor(SensorEntity):
     async def _fetch_nomp_pool_stats(self, api_data=None):
         self.check_valid_config()
 
-        hashrate_data, api_data = await self._async_api_fetch(
+        pool_found, api_data = await self._async_api_fetch(
             api_data,
             API_ENDPOINT_NOMP_POOL_STATS.format(self._api_domain_name),
             self._extract_data_nomp_pool_stats_full,
             self._extract_data_nomp_pool_stats_primary
         )
 
-        if hashrate_data is not None:
+        if pool_found and api_data is not None:
+            pool_data = self._extract_data_nomp_pool_stats_special(api_data)
+            hashrate_data = float(pool_data["hashrate"])
+
             self._update_all_properties(
-                state=float(hashrate_data),
-                hashrate=float(hashrate_data),
-                block_height=int(api_data["height"]),
-                worker_count=int(api_data["workerCount"]),
-                last_block=int(api_data["lastBlock"]),
-                blocks_pending=int(api_data["blocks_pending"]),
-                blocks_confirmed=int(api_data["blocks_confirmed"]),
-                blocks_orphaned=int(api_data["blocks_orphaned"]),
+                state=hashrate_data,
+                hashrate=hashrate_data,
+                block_height=int(pool_data["height"]),
+                worker_count=int(pool_data["workerCount"]),
+                last_block=int(pool_data["lastBlock"]),
+                blocks_pending=int(pool_data["blocks_pending"]),
+                blocks_confirmed=int(pool_data["blocks_confirmed"]),
+                blocks_orphaned=int(pool_data["blocks_orphaned"]),
             )
 
         else:
@@ -1091,12 +1683,13 @@ class CryptoinfoAdvSensor(SensorEntity):
 
         mempool_data, api_data = await self._async_api_fetch(
             api_data,
-            API_ENDPOINT_MEMPOOL_STATS.format(API_BASE_URL_MEMPOOLSPACE),
+            self._provider.build_url(API_ENDPOINT_MEMPOOL_STATS),
             self._extract_data_mempool_stats_full,
             self._extract_data_mempool_stats_primary
         )
 
         if mempool_data is not None:
+            self._fee_histogram = api_data["fee_histogram"]
             self._update_all_properties(
                 state=int(mempool_data),
                 mempool_tx_count=int(api_data["count"]),
@@ -1113,7 +1706,7 @@ class CryptoinfoAdvSensor(SensorEntity):
 
         mempool_data, api_data = await self._async_api_fetch(
             api_data,
-            API_ENDPOINT_MEMPOOL_FEES.format(API_BASE_URL_MEMPOOLSPACE),
+            self._provider.build_url(API_ENDPOINT_MEMPOOL_FEES),
             self._extract_data_mempool_fees_full,
             self._extract_data_mempool_fees_primary
         )
@@ -1138,7 +1731,7 @@ class CryptoinfoAdvSensor(SensorEntity):
 
         mempool_data, api_data = await self._async_api_fetch(
             api_data,
-            API_ENDPOINT_MEMPOOL_NEXT_BLOCKS.format(API_BASE_URL_MEMPOOLSPACE),
+            self._provider.build_url(API_ENDPOINT_MEMPOOL_NEXT_BLOCKS),
             self._extract_data_mempool_next_block_full,
             self._extract_data_mempool_next_block_primary
         )
@@ -1168,52 +1761,72 @@ class CryptoinfoAdvSensor(SensorEntity):
         if self._fetch_args is None:
             return None
 
-        args = self._fetch_args
+        if self._fetch_args_template is None:
+            return self._fetch_args
 
-        if "{" not in args:
-            return args
+        if self._rendered_fetch_args is not None:
+            return self._rendered_fetch_args
 
-        else:
-            args_compiled = Template(args, self.hass)
+        # Not tracked yet, render it directly until the tracker takes over
+        try:
+            self._fetch_args_template.hass = self.hass
+            rendered_args = self._fetch_args_template.async_render({"arguments": self._fetch_args})
+        except TemplateError as ex:
+            _LOGGER.exception("Error rendering args template: %s", ex)
+            return None
 
-        if args_compiled:
-            try:
-                args_to_render = {"arguments": args}
-                rendered_args = args_compiled.async_render(args_to_render)
-            except TemplateError as ex:
-                _LOGGER.exception("Error rendering args template: %s", ex)
-                return
+        return f"{rendered_args}"
 
-        else:
-            rendered_args = None
+    def _get_fetch_args(self, min_length=1, expected_length=1, default_value=None):
+        rendered_args = self._render_fetch_args()
+        cache_key = (rendered_args, min_length, expected_length, default_value)
 
-        if rendered_args == args:
-            # No template used. default behavior
-            pass
+        if cache_key in self._fetch_args_cache:
+            return self._fetch_args_cache[cache_key]
+
+        if rendered_args is None or not len(rendered_args):
+            fetch_args = tuple(None for x in range(expected_length))
 
         else:
-            # Template used. Construct the string used in the shell
-            args = f"{rendered_args}"
+            split_args = rendered_args.split(" ")
+            args_len = len(split_args)
 
-        return args
+            if not args_len >= min_length:
+                fetch_args = tuple(None for x in range(expected_length))
 
-    def _get_fetch_args(self, min_length=1, expected_length=1, default_value=None):
-        rendered_args = self._render_fetch_args()
+            else:
+                if args_len < expected_length:
+                    split_args.extend([default_value for x in range(expected_length - args_len)])
 
-        if rendered_args is None or not len(rendered_args):
-            return (None for x in range(expected_length))
+                fetch_args = tuple(
+                    arg.strip() if isinstance(arg, str) else arg for arg in split_args[:expected_length]
+                )
+
+        self._fetch_args_cache = {cache_key: fetch_args}
+        return fetch_args
 
-        split_args = rendered_args.split(" ")
-        args_len = len(split_args)
+    def _should_write_state(self, state):
+        if self._state is None or state is None or not self._attr_available:
+            return True
 
-        if not args_len >= min_length:
-            return (None for x in range(expected_length))
+        if time.time() - self._last_state_write < self._min_write_interval.total_seconds():
+            return False
 
-        if args_len < expected_length:
-            split_args.extend([default_value for x in range(expected_length - args_len)])
+        try:
+            state_delta = abs(float(state) - float(self._state))
+        except (TypeError, ValueError):
+            return True
 
-        return (arg.strip() for arg in split_args[:expected_length])
+        if self._deadband_absolute > 0 and state_delta <= self._deadband_absolute:
+            return False
 
+        if self._deadband_relative > 0 and self._state != 0:
+            if (state_delta / abs(float(self._state))) * 100 <= self._deadband_relative:
+                return False
+
+        return True
+
+    @timed_section(LOOP_SECTION_PROPERTY_UPDATE)
     def _update_all_properties(
         self,
         state=None,
@@ -1257,59 +1870,223 @@ class CryptoinfoAdvSensor(SensorEntity):
         mempool_next_block_fee_range_max=None,
         available=True,
     ):
+        properties = {k: v for k, v in locals().items() if k in self.property_attrs}
+
         if available:
             self._fetch_failure_count = 0
-        self._state = state
-        self._last_update = datetime.today().strftime("%d-%m-%Y %H:%M")
-        self._base_price = base_price
-        self._24h_volume = volume_24h
-        self._1h_change = change_1h
-        self._24h_change = change_24h
-        self._7d_change = change_7d
-        self._30d_change = change_30d
-        self._market_cap = market_cap
-        self._circulating_supply = circulating_supply
-        self._total_supply = total_supply
-        self._all_time_high = all_time_high
-        self._all_time_low = all_time_low
-        self._24h_low = low_24h
-        self._24h_high = high_24h
-        self._image_url = image_url
-        self._difficulty = difficulty
-        self._hashrate = hashrate
-        self._pool_control_1000b = pool_control_1000b
-        self._block_height = block_height
-        self._worker_count = worker_count
-        self._last_block = last_block
-        self._blocks_pending = blocks_pending
-        self._blocks_confirmed = blocks_confirmed
-        self._blocks_orphaned = blocks_orphaned
-        self._mempool_tx_count = mempool_tx_count
-        self._mempool_total_fee = mempool_total_fee
-        self._mempool_fees_fastest = mempool_fees_fastest
-        self._mempool_fees_30min = mempool_fees_30min
-        self._mempool_fees_60min = mempool_fees_60min
-        self._mempool_fees_eco = mempool_fees_eco
-        self._mempool_fees_minimum = mempool_fees_minimum
-        self._mempool_next_block_size = mempool_next_block_size
-        self._mempool_next_block_tx_count = mempool_next_block_tx_count
-        self._mempool_next_block_total_fee = mempool_next_block_total_fee
-        self._mempool_next_block_median_fee = mempool_next_block_median_fee
-        self._mempool_next_block_fee_range_min = mempool_next_block_fee_range_min
-        self._mempool_next_block_fee_range_max = mempool_next_block_fee_range_max
-        self._attr_available = available
-        if ath_date and len(ath_date) > 0:
-            try:
-                self._ath_date = dtparser.parse(ath_date)
-            except Exception:
-                self._ath_date = None
-        if atl_date and len(atl_date) > 0:
+            self._last_observed_state = state
+            self._last_good_fetch_time = time.time()
+
+            if self._history is not None and state is not None:
+                self._history.add(time.time(), float(state))
+
+            if not self._should_write_state(state):
+                # The filters hold back the state and everything that moves with it, so the poll writes nothing new
+                properties = {k: v for k, v in properties.items() if k in self.filter_exempt_properties}
+
+        if "state" in properties:
+            self._last_state_write = time.time()
+            self._last_update_time = self._last_state_write
+
+        changed = set()
+
+        for (key, value) in properties.items():
+            attr = self.property_attrs[key]
+
+            if getattr(self, attr) != value:
+                setattr(self, attr, value)
+                changed.add(key)
+
+        if self._update_date("_ath_date", ath_date):
+            changed.add("ath_date")
+
+        if self._update_date("_atl_date", atl_date):
+            changed.add("atl_date")
+
+        if not len(changed):
+            return changed
+
+        self._last_change_time = time.time()
+        CryptoInfoAdvEntityManager.instance(self.hass).update_entity_aggregates(self)
+        self._update_child_sensors(changed, write_state=True)
+
+        return changed
+
+    property_attrs = {
+        "state": "_state",
+        "base_price": "_base_price",
+        "volume_24h": "_24h_volume",
+        "change_1h": "_1h_change",
+        "change_24h": "_24h_change",
+        "change_7d": "_7d_change",
+        "change_30d": "_30d_change",
+        "market_cap": "_market_cap",
+        "circulating_supply": "_circulating_supply",
+        "total_supply": "_total_supply",
+        "all_time_high": "_all_time_high",
+        "all_time_low": "_all_time_low",
+        "low_24h": "_24h_low",
+        "high_24h": "_24h_high",
+        "image_url": "_image_url",
+        "difficulty": "_difficulty",
+        "hashrate": "_hashrate",
+        "pool_control_1000b": "_pool_control_1000b",
+        "block_height": "_block_height",
+        "worker_count": "_worker_count",
+        "last_block": "_last_block",
+        "blocks_pending": "_blocks_pending",
+        "blocks_confirmed": "_blocks_confirmed",
+        "blocks_orphaned": "_blocks_orphaned",
+        "mempool_tx_count": "_mempool_tx_count",
+        "mempool_total_fee": "_mempool_total_fee",
+        "mempool_fees_fastest": "_mempool_fees_fastest",
+        "mempool_fees_30min": "_mempool_fees_30min",
+        "mempool_fees_60min": "_mempool_fees_60min",
+        "mempool_fees_eco": "_mempool_fees_eco",
+        "mempool_fees_minimum": "_mempool_fees_minimum",
+        "mempool_next_block_size": "_mempool_next_block_size",
+        "mempool_next_block_tx_count": "_mempool_next_block_tx_count",
+        "mempool_next_block_total_fee": "_mempool_next_block_total_fee",
+        "mempool_next_block_median_fee": "_mempool_next_block_median_fee",
+        "mempool_next_block_fee_range_min": "_mempool_next_block_fee_range_min",
+        "mempool_next_block_fee_range_max": "_mempool_next_block_fee_range_max",
+        "available": "_attr_available",
+    }
+
+    # Slow moving properties that are still published while the filters hold back the state
+    filter_exempt_properties = (
+        "circulating_supply",
+        "total_supply",
+        "all_time_high",
+        "all_time_low",
+        "image_url",
+        "block_height",
+        "last_block",
+        "blocks_confirmed",
+        "blocks_orphaned",
+        "available",
+    )
+
+    # Properties each extra sensor is computed from, keys missing here also depend on time or other entities
+    child_attribute_sources = {
+        ATTR_BASE_PRICE: ("base_price",),
+        ATTR_24H_VOLUME: ("volume_24h",),
+        ATTR_1H_CHANGE: ("change_1h",),
+        ATTR_24H_CHANGE: ("change_24h",),
+        ATTR_7D_CHANGE: ("change_7d",),
+        ATTR_30D_CHANGE: ("change_30d",),
+        ATTR_MARKET_CAP: ("market_cap",),
+        ATTR_CIRCULATING_SUPPLY: ("circulating_supply",),
+        ATTR_TOTAL_SUPPLY: ("total_supply",),
+        ATTR_ALL_TIME_HIGH: ("all_time_high",),
+        ATTR_ALL_TIME_LOW: ("all_time_low",),
+        ATTR_24H_LOW: ("low_24h",),
+        ATTR_24H_HIGH: ("high_24h",),
+        ATTR_IMAGE_URL: ("image_url",),
+        ATTR_ALL_TIME_HIGH_DATE: ("ath_date",),
+        ATTR_ALL_TIME_LOW_DATE: ("atl_date",),
+        ATTR_ALL_TIME_HIGH_DISTANCE: ("state", "all_time_high"),
+        ATTR_DIFFICULTY: ("difficulty",),
+        ATTR_DIFFICULTY_CALC: ("difficulty",),
+        ATTR_HASHRATE: ("hashrate",),
+        ATTR_HASHRATE_CALC: ("hashrate",),
+        ATTR_BLOCK_HEIGHT: ("block_height",),
+        ATTR_POOL_CONTROL_1000B: ("pool_control_1000b",),
+        ATTR_POOL_CONTROL_1000B_PERC: ("pool_control_1000b",),
+        ATTR_WORKER_COUNT: ("worker_count",),
+        ATTR_LAST_BLOCK: ("last_block",),
+        ATTR_BLOCKS_PENDING: ("blocks_pending",),
+        ATTR_BLOCKS_CONFIRMED: ("blocks_confirmed",),
+        ATTR_BLOCKS_ORPHANED: ("blocks_orphaned",),
+        ATTR_MEMPOOL_SIZE_CALC: ("state",),
+        ATTR_MEMPOOL_TX_COUNT: ("mempool_tx_count",),
+        ATTR_MEMPOOL_TOTAL_FEE: ("mempool_total_fee",),
+        ATTR_MEMPOOL_TOTAL_FEE_CALC: ("mempool_total_fee",),
+        ATTR_MEMPOOL_AVERAGE_FEE_PER_TX: ("mempool_total_fee", "mempool_tx_count"),
+        ATTR_MEMPOOL_FEES_FASTEST: ("mempool_fees_fastest",),
+        ATTR_MEMPOOL_FEES_30MIN: ("mempool_fees_30min",),
+        ATTR_MEMPOOL_FEES_60MIN: ("mempool_fees_60min",),
+        ATTR_MEMPOOL_FEES_ECO: ("mempool_fees_eco",),
+        ATTR_MEMPOOL_FEES_MINIMUM: ("mempool_fees_minimum",),
+        ATTR_MEMPOOL_NEXT_BLOCK_SIZE: ("mempool_next_block_size",),
+        ATTR_MEMPOOL_NEXT_BLOCK_SIZE_CALC: ("mempool_next_block_size",),
+        ATTR_MEMPOOL_NEXT_BLOCK_TX_COUNT: ("mempool_next_block_tx_count",),
+        ATTR_MEMPOOL_NEXT_BLOCK_TOTAL_FEE: ("mempool_next_block_total_fee",),
+        ATTR_MEMPOOL_NEXT_BLOCK_TOTAL_FEE_CALC: ("mempool_next_block_total_fee",),
+        ATTR_MEMPOOL_NEXT_BLOCK_MEDIAN_FEE: ("mempool_next_block_median_fee",),
+        ATTR_MEMPOOL_NEXT_BLOCK_FEE_RANGE_MIN: ("mempool_next_block_fee_range_min",),
+        ATTR_MEMPOOL_NEXT_BLOCK_FEE_RANGE_MAX: ("mempool_next_block_fee_range_max",),
+        ATTR_MEMPOOL_NEXT_BLOCK_FEE_RANGE_COMBINED: ("mempool_next_block_fee_range_min", "mempool_next_block_fee_range_max"),
+        CONF_DIFF_MULTIPLIER: (),
+        CONF_BLOCK_TIME_MINUTES: (),
+        CONF_DIFFICULTY_WINDOW: (),
+        CONF_HALVING_WINDOW: (),
+    }
+
+    def _update_date(self, attr, raw_date):
+        if not raw_date or raw_date == getattr(self, f"{attr}_raw"):
+            return False
+
+        setattr(self, f"{attr}_raw", raw_date)
+
+        try:
+            # CoinGecko sends ISO-8601, dateutil is only needed for anything else
+            parsed_date = datetime.fromisoformat(raw_date.replace("Z", "+00:00"))
+        except ValueError:
             try:
-                self._atl_date = dtparser.parse(atl_date)
+                parsed_date = dtparser.parse(raw_date)
             except Exception:
-                self._atl_date = None
+                parsed_date = None
+
+        setattr(self, attr, parsed_date)
+
+        return True
+
+    def _write_state(self):
+        if self.hass is not None and self.entity_id is not None:
+            self.async_write_ha_state()
+
+    def recompute_dependencies(self):
+        if self._fetch_type == CryptoInfoAdvDataFetchType.CHAIN_CONTROL:
+            self._update_remaining_hash_control()
+            self._write_state()
+
+        else:
+            self._update_child_sensors(write_state=True)
+
+    async def async_added_to_hass(self):
+        await super().async_added_to_hass()
+
+        if self._fetch_args_template is None or self._is_child_sensor:
+            return
+
+        self._fetch_args_template.hass = self.hass
+        track_info = async_track_template_result(
+            self.hass,
+            [TrackTemplate(self._fetch_args_template, {"arguments": self._fetch_args})],
+            self._async_on_fetch_args_rendered,
+        )
+        self.async_on_remove(track_info.async_remove)
+        track_info.async_refresh()
+
+    @callback
+    def _async_on_fetch_args_rendered(self, event, updates):
+        result = updates.pop().result
+
+        if isinstance(result, TemplateError):
+            _LOGGER.error("Error rendering args template: %s", result)
+            result = None
 
-        self._update_child_sensors()
+        # The tracker parses results, so an all digit argument such as a block height comes back as an int
+        self._rendered_fetch_args = f"{result}" if result is not None else None
+        self._fetch_args_cache = dict()
+
+    async def async_will_remove_from_hass(self):
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            self._refresh_task = None
+
+        CryptoInfoAdvEntityManager.instance(self.hass).remove_entity(self)
 
     def get_child_data(self, child_sensor):
         child_data = self.get_extra_sensor_attrs(
@@ -1318,12 +2095,27 @@ class CryptoinfoAdvSensor(SensorEntity):
 
         return child_data.get(child_sensor.attribute_key)
 
-    def _update_child_sensors(self):
+    def _get_subscribed_child_sensors(self, changed):
+        if changed is None or "available" in changed:
+            return self._child_sensors
+
+        subscribed = set()
+        for key in changed:
+            subscribed.update(self._child_subscriptions.get(key, ()))
+
+        return [
+            sensor for sensor in self._child_sensors
+            if sensor in subscribed or sensor.attribute_key not in self.child_attribute_sources
+        ]
+
+    @timed_section(LOOP_SECTION_CHILD_FAN_OUT)
+    def _update_child_sensors(self, changed=None, write_state=False):
         if not len(self._child_sensors) > 0:
             return
 
-        for sensor in self._child_sensors:
-            sensor._update()
+        for sensor in self._get_subscribed_child_sensors(changed):
+            if sensor._update() and write_state:
+                sensor._write_state()
 
     def init_child_sensors(self):
         child_sensors = list()
@@ -1331,6 +2123,9 @@ class CryptoinfoAdvSensor(SensorEntity):
         if self._child_sensor_config is None or not len(self._child_sensor_config):
             return child_sensors
 
+        if any(conf[CONF_EXTRA_SENSOR_PROPERTY] in self.rolling_extra_sensor_keys for conf in self._child_sensor_config):
+            self._history = CryptoInfoAdvHistory(self._history_size)
+
         valid_child_conf = list([
             conf for conf in self._child_sensor_config
             if conf[CONF_EXTRA_SENSOR_PROPERTY] in self.valid_attribute_keys
@@ -1342,6 +2137,20 @@ class CryptoinfoAdvSensor(SensorEntity):
             state_class = conf.get(CONF_STATE_CLASS)
             attribute_key = conf.get(CONF_EXTRA_SENSOR_PROPERTY)
             unit_of_measurement = conf.get(CONF_UNIT_OF_MEASUREMENT)
+            deadband_absolute = conf.get(CONF_DEADBAND_ABSOLUTE, self._deadband_absolute)
+            deadband_relative = conf.get(CONF_DEADBAND_RELATIVE, self._deadband_relative)
+            min_write_interval = conf.get(CONF_MIN_WRITE_INTERVAL)
+            window = conf.get(CONF_EXTRA_SENSOR_WINDOW)
+            window = timedelta(minutes=window) if window is not None else None
+            target = conf.get(CONF_EXTRA_SENSOR_TARGET)
+
+            if len(self.currency_group) > 1:
+                id_name = f"{id_name} {self.currency_name.upper()}" if id_name else id_name
+                unique_id = f"{unique_id}_{self.currency_name}" if unique_id else unique_id
+
+            if attribute_key in self.rolling_extra_sensor_keys:
+                self._history.add_window(window.total_seconds() if window is not None else None)
+
             child_sensors.append(
                 CryptoinfoAdvChildSensor(
                     self,
@@ -1350,27 +2159,145 @@ class CryptoinfoAdvSensor(SensorEntity):
                     state_class,
                     attribute_key,
                     unit_of_measurement,
+                    deadband_absolute,
+                    deadband_relative,
+                    timedelta(minutes=min_write_interval) if min_write_interval is not None else self._min_write_interval,
+                    window,
+                    target,
                 )
             )
 
         self._child_sensors = child_sensors
+        self._child_subscriptions = dict()
+
+        for sensor in child_sensors:
+            for key in self.child_attribute_sources.get(sensor.attribute_key, ()):
+                self._child_subscriptions.setdefault(key, list()).append(sensor)
 
         return child_sensors
 
     def _process_failed_fetch(self):
         self._fetch_failure_count = self._fetch_failure_count + 1
 
+        # With serve_stale the availability follows the age of the data instead
+        if self._serve_stale:
+            return
+
         if self._fetch_failure_count >= self._max_fetch_failures:
+            self._fee_histogram = None
             self._update_all_properties(available=False)
 
+    def _adapt_update_interval(self, previous_state):
+        observed_changes = list()
+
+        if self._1h_change is not None:
+            observed_changes.append(abs(float(self._1h_change)))
+
+        if previous_state and self._last_observed_state is not None:
+            observed_changes.append(abs((float(self._last_observed_state) - previous_state) / previous_state) * 100)
+
+        if not len(observed_changes):
+            return
+
+        if max(observed_changes) >= self._adaptive_threshold:
+            interval = self._effective_update_interval * ADAPTIVE_INTERVAL_SHRINK
+        else:
+            interval = self._effective_update_interval * ADAPTIVE_INTERVAL_GROWTH
+
+        rate_budget_interval = timedelta(seconds=CryptoInfoAdvEntityManager.instance(self.hass).get_rate_budget_interval(self))
+
+        self._effective_update_interval = min(
+            max(interval, self._adaptive_min_frequency, rate_budget_interval),
+            max(self._adaptive_max_frequency, rate_budget_interval),
+        )
+
+    async def _async_adaptive_update(self):
+        if time.time() - self._last_fetch_attempt < self._effective_update_interval.total_seconds():
+            return
+
+        self._last_fetch_attempt = time.time()
+        previous_state = self._last_observed_state
+
+        await self._async_update()
+
+        if self._attr_available:
+            self._adapt_update_interval(float(previous_state) if previous_state is not None else None)
+
+    @property
+    def data_age(self):
+        if self._last_good_fetch_time is None:
+            return None
+
+        return time.time() - self._last_good_fetch_time
+
+    @property
+    def data_changed(self):
+        if self._last_change_time is None:
+            return None
+
+        return datetime.fromtimestamp(self._last_change_time).strftime("%d-%m-%Y %H:%M")
+
+    @property
+    def is_stale(self):
+        age = self.data_age
+
+        return age is None or age > self._effective_update_interval.total_seconds() * SERVE_STALE_EXPIRY_INTERVALS
+
+    def _check_staleness(self):
+        last_good_fetch_time = self._last_good_fetch_time or self._serve_stale_since
+
+        if self._attr_available and time.time() - last_good_fetch_time > self._max_staleness.total_seconds():
+            self._update_all_properties(available=False)
+
+    async def _async_serve_stale_update(self):
+        # The entity renders from the data it has, fetching happens in the background
+        if self._refresh_task is None and self.hass is not None:
+            self._refresh_task = self.hass.async_create_task(self._async_background_refresh())
+
+        self._check_staleness()
+
+    async def _async_background_refresh(self):
+        last_change_time = self._last_change_time
+
+        try:
+            await self._async_refresh()
+        finally:
+            self._refresh_task = None
+
+        self._check_staleness()
+
+        if self._last_change_time != last_change_time:
+            self._write_state()
+
     async def _async_update(self):
+        if not CryptoInfoAdvEntityManager.instance(self.hass).is_shared_entity(self):
+            await self._async_fetch_and_update()
+            return
+
+        # Sensors sharing a data key wait for the one already fetching it and reuse its result
+        async with CryptoInfoAdvEntityManager.instance(self.hass).get_fetch_lock(self):
+            await self._async_fetch_and_update()
+
+    async def _async_fetch_and_update(self):
         api_data = None
 
-        if not CryptoInfoAdvEntityManager.instance().should_fetch_entity(self):
-            api_data = CryptoInfoAdvEntityManager.instance().fetch_cached_entity_data(self)
+        if self._block_gating:
+            await self._async_probe_tip_height()
+
+        if not CryptoInfoAdvEntityManager.instance(self.hass).should_fetch_entity(self):
+            if self._block_gating and self._last_applied_fetch == CryptoInfoAdvEntityManager.instance(self.hass).get_last_fetch(
+                    CryptoInfoAdvEntityManager.instance(self.hass).get_entity_data_key(self)):
+                return
+
+            api_data = CryptoInfoAdvEntityManager.instance(self.hass).fetch_cached_entity_data(self)
+
+        fetched = api_data is None
 
         try:
-            if self._fetch_type == CryptoInfoAdvDataFetchType.DOMINANCE:
+            if self._fetch_type == CryptoInfoAdvDataFetchType.PRICE_HISTORY:
+                api_data = await self._fetch_price_history(api_data)
+
+            elif self._fetch_type == CryptoInfoAdvDataFetchType.DOMINANCE:
                 api_data = await self._fetch_dominance(api_data)
 
             elif self._fetch_type == CryptoInfoAdvDataFetchType.CHAIN_SUMMARY:
@@ -1397,6 +2324,9 @@ class CryptoinfoAdvSensor(SensorEntity):
             elif self._fetch_type == CryptoInfoAdvDataFetchType.MEMPOOL_NEXT_BLOCK:
                 api_data = await self._fetch_mempool_next_block(api_data)
 
+            elif self._hedge_requests:
+                api_data = await self._fetch_price_data_hedged(api_data)
+
             else:
                 api_data = await self._fetch_price_data_main(api_data)
 
@@ -1407,7 +2337,12 @@ class CryptoinfoAdvSensor(SensorEntity):
                 self._process_failed_fetch()
                 return
 
-        CryptoInfoAdvEntityManager.instance().set_cached_entity_data(self, api_data)
+        if fetched:
+            CryptoInfoAdvEntityManager.instance(self.hass).set_cached_entity_data(self, api_data)
+
+        self._last_applied_fetch = CryptoInfoAdvEntityManager.instance(self.hass).get_last_fetch(
+            CryptoInfoAdvEntityManager.instance(self.hass).get_entity_data_key(self)
+        )
 
 
 class CryptoinfoAdvChildSensor(CryptoinfoAdvSensor):
@@ -1419,9 +2354,17 @@ class CryptoinfoAdvChildSensor(CryptoinfoAdvSensor):
         state_class,
         attribute_key,
         unit_of_measurement,
+        deadband_absolute=None,
+        deadband_relative=None,
+        min_write_interval=None,
+        window=None,
+        target=None,
         *args,
         **kwargs
     ):
+        self._window = window
+        self._target = target
+
         super().__init__(
             hass=parent_sensor.hass,
             cryptocurrency_name=parent_sensor.cryptocurrency_name,
@@ -1432,13 +2375,18 @@ class CryptoinfoAdvChildSensor(CryptoinfoAdvSensor):
             id_name=id_name,
             unique_id=unique_id,
             state_class=state_class,
-            api_mode=CryptoInfoAdvEntityManager.instance().get_extra_sensor_fetch_type_from_str(parent_sensor, attribute_key),
+            api_mode=CryptoInfoAdvEntityManager.instance(parent_sensor.hass).get_extra_sensor_fetch_type_from_str(
+                parent_sensor, attribute_key
+            ),
             pool_prefix=parent_sensor.pool_prefixes,
             fetch_args=parent_sensor._fetch_args,
             extra_sensors="",
             api_domain_name="",
             pool_name=parent_sensor._pool_name,
             max_fetch_failures=parent_sensor._max_fetch_failures,
+            deadband_absolute=deadband_absolute,
+            deadband_relative=deadband_relative,
+            min_write_interval=min_write_interval,
             is_child_sensor=True,
         )
 
@@ -1449,6 +2397,25 @@ class CryptoinfoAdvChildSensor(CryptoinfoAdvSensor):
     def attribute_key(self):
         return self._attribute_key
 
+    @property
+    def window(self):
+        return self._window
+
+    @property
+    def target(self):
+        return self._target
+
+    def _build_unique_id(self):
+        unique_id = super()._build_unique_id()
+
+        if self._window is not None:
+            unique_id = f"{unique_id}_{int(self._window.total_seconds())}"
+
+        if self._target is not None:
+            unique_id = f"{unique_id}_{self._target:g}"
+
+        return unique_id
+
     async def _async_update(self):
         self._update()
 
@@ -1456,7 +2423,9 @@ class CryptoinfoAdvChildSensor(CryptoinfoAdvSensor):
         new_state = self._parent_sensor.get_child_data(self)
 
         if new_state is not None and new_state != self._state:
-            self._update_all_properties(state=new_state)
+            return bool(self._update_all_properties(state=new_state))
 
         elif new_state is None:
             self._process_failed_fetch()
+
+        return False
@@ -0,0 +1,221 @@
+import math
+from array import array
+from collections import deque
+from datetime import datetime
+
+from .const.const import (
+    DAY_SECONDS,
+)
+
+
+class CryptoInfoAdvRollingWindow:
+    def __init__(self, history, window_seconds):
+        self._history = history
+        self._window_seconds = window_seconds
+        self._start = history.head
+        self._end = history.head
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._min_seqs = deque()
+        self._max_seqs = deque()
+
+    @property
+    def window_seconds(self):
+        return self._window_seconds
+
+    @property
+    def count(self):
+        return self._end - self._start
+
+    @property
+    def mean(self):
+        if not self.count:
+            return None
+
+        return self._mean
+
+    @property
+    def stddev(self):
+        if self.count < 2:
+            return None
+
+        return math.sqrt(self._m2 / (self.count - 1))
+
+    @property
+    def min(self):
+        if not self._min_seqs:
+            return None
+
+        return self._history.value_at(self._min_seqs[0])
+
+    @property
+    def max(self):
+        if not self._max_seqs:
+            return None
+
+        return self._history.value_at(self._max_seqs[0])
+
+    @property
+    def rate_of_change(self):
+        if self.count < 2:
+            return None
+
+        first_seq, last_seq = self._start, self._end - 1
+        time_delta = self._history.timestamp_at(last_seq) - self._history.timestamp_at(first_seq)
+
+        if time_delta <= 0:
+            return None
+
+        value_delta = self._history.value_at(last_seq) - self._history.value_at(first_seq)
+
+        return (value_delta / time_delta) * 3600
+
+    def push(self, seq, value):
+        self._end = seq + 1
+        delta = value - self._mean
+        self._mean += delta / self.count
+        self._m2 += delta * (value - self._mean)
+
+        while self._min_seqs and self._history.value_at(self._min_seqs[-1]) >= value:
+            self._min_seqs.pop()
+        self._min_seqs.append(seq)
+
+        while self._max_seqs and self._history.value_at(self._max_seqs[-1]) <= value:
+            self._max_seqs.pop()
+        self._max_seqs.append(seq)
+
+    def _pop(self):
+        seq = self._start
+        value = self._history.value_at(seq)
+        self._start += 1
+
+        if not self.count:
+            self._mean = 0.0
+            self._m2 = 0.0
+        else:
+            delta = value - self._mean
+            self._mean -= delta / self.count
+            self._m2 = max(self._m2 - delta * (value - self._mean), 0.0)
+
+        if self._min_seqs and self._min_seqs[0] == seq:
+            self._min_seqs.popleft()
+
+        if self._max_seqs and self._max_seqs[0] == seq:
+            self._max_seqs.popleft()
+
+    def evict_before(self, seq):
+        while self.count and self._start < seq:
+            self._pop()
+
+    def evict_older_than(self, timestamp):
+        while self.count and self._history.timestamp_at(self._start) < timestamp:
+            self._pop()
+
+
+class CryptoInfoAdvHistory:
+    def __init__(self, capacity):
+        self._capacity = max(int(capacity), 2)
+        self._timestamps = array("d", [0.0]) * self._capacity
+        self._values = array("d", [0.0]) * self._capacity
+        self._head = 0
+        self._windows = dict()
+
+    @property
+    def capacity(self):
+        return self._capacity
+
+    @property
+    def head(self):
+        return self._head
+
+    @property
+    def count(self):
+        return min(self._head, self._capacity)
+
+    def timestamp_at(self, seq):
+        return self._timestamps[seq % self._capacity]
+
+    def value_at(self, seq):
+        return self._values[seq % self._capacity]
+
+    def add_window(self, window_seconds=None):
+        window_seconds = window_seconds if window_seconds is not None else math.inf
+
+        if window_seconds not in self._windows:
+            self._windows[window_seconds] = CryptoInfoAdvRollingWindow(self, window_seconds)
+
+        return self._windows[window_seconds]
+
+    def get_window(self, window_seconds=None):
+        return self._windows.get(window_seconds if window_seconds is not None else math.inf)
+
+    def add(self, timestamp, value):
+        seq = self._head
+
+        if seq >= self._capacity:
+            overwritten_seq = seq - self._capacity
+            for window in self._windows.values():
+                window.evict_before(overwritten_seq + 1)
+
+        self._timestamps[seq % self._capacity] = timestamp
+        self._values[seq % self._capacity] = value
+        self._head += 1
+
+        for window in self._windows.values():
+            window.push(seq, value)
+            window.evict_older_than(timestamp - window.window_seconds)
+
+
+class CryptoInfoAdvOrphanSeries:
+    def __init__(self, max_days=365):
+        self._max_days = max_days
+        self._start_day = None
+        self._counts = array("I")
+
+    @property
+    def start_day(self):
+        return self._start_day
+
+    @property
+    def end_day(self):
+        if self._start_day is None:
+            return None
+
+        return self._start_day + len(self._counts)
+
+    def merge(self, start_day, counts):
+        start_day = int(start_day)
+
+        # The full series usually starts before the trimmed one, the days before it are already known
+        if self._start_day is not None and start_day < self._start_day < start_day + len(counts):
+            counts = counts[self._start_day - start_day:]
+            start_day = self._start_day
+
+        if self._start_day is None or start_day < self._start_day or start_day > self.end_day:
+            self._start_day = start_day
+            self._counts = array("I", counts)
+
+        else:
+            # Only the last known day can still change, everything before it is final
+            first_new_index = max(self.end_day - 1 - start_day, 0)
+            del self._counts[(start_day - self._start_day) + first_new_index:]
+            self._counts.extend(counts[first_new_index:])
+
+        excess_days = len(self._counts) - self._max_days
+        if excess_days > 0:
+            del self._counts[:excess_days]
+            self._start_day += excess_days
+
+    @property
+    def orphans_today(self):
+        if not len(self._counts):
+            return None
+
+        last_orphan_date = datetime.fromtimestamp(self.end_day * DAY_SECONDS).date()
+        return self._counts[-1] if datetime.now().date() == last_orphan_date else 0
+
+    def orphans_in_days(self, days):
+        if not len(self._counts):
+            return None
+
+        return sum(self._counts[-days:])
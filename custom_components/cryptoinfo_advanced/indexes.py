@@ -0,0 +1,52 @@
+from bisect import bisect_left
+from itertools import accumulate
+
+
+class CryptoInfoAdvPoolIndex:
+    def __init__(self, pools):
+        entries = sorted((str(pool["name"]).lower(), int(pool["nb100"]), int(pool["nb1000"])) for pool in pools)
+
+        self._names = [name for (name, _, _) in entries]
+        self._nb100_sums = [0, *accumulate(nb100 for (_, nb100, _) in entries)]
+        self._nb1000_sums = [0, *accumulate(nb1000 for (_, _, nb1000) in entries)]
+
+    def _prefix_range(self, pool_prefix):
+        pool_prefix = pool_prefix.lower()
+        return (
+            bisect_left(self._names, pool_prefix),
+            bisect_left(self._names, pool_prefix + "\U0010ffff"),
+        )
+
+    def lookup(self, pool_prefix):
+        (start, end) = self._prefix_range(pool_prefix)
+
+        return (
+            end - start,
+            self._nb100_sums[end] - self._nb100_sums[start],
+            self._nb1000_sums[end] - self._nb1000_sums[start],
+        )
+
+
+class CryptoInfoAdvFeeHistogramIndex:
+    def __init__(self, fee_histogram):
+        entries = sorted(((float(fee_rate), int(vsize)) for (fee_rate, vsize) in fee_histogram), reverse=True)
+
+        # Fee rates are kept negated so both lists ascend for bisect
+        self._negated_fee_rates = [-fee_rate for (fee_rate, _) in entries]
+        self._vsize_sums = [0, *accumulate(vsize for (_, vsize) in entries)]
+
+    @property
+    def total_vsize(self):
+        return self._vsize_sums[-1]
+
+    def fee_rate_for_depth(self, vsize):
+        if not len(self._negated_fee_rates):
+            return None
+
+        # The first bucket whose cumulative size reaches the depth sets the fee rate to match
+        index = min(bisect_left(self._vsize_sums, vsize, 1), len(self._negated_fee_rates))
+
+        return -self._negated_fee_rates[index - 1]
+
+    def depth_ahead_of_fee_rate(self, fee_rate):
+        return self._vsize_sums[bisect_left(self._negated_fee_rates, -float(fee_rate))]
@@ -0,0 +1,132 @@
+import numpy as np
+
+from .const.const import (
+    DAY_SECONDS,
+)
+
+
+class CryptoInfoAdvPriceSeries:
+    def __init__(self, timestamps, prices, max_samples=None):
+        timestamps = np.asarray(timestamps, dtype=np.int64)
+        prices = np.asarray(prices, dtype=np.float64)
+        count = len(prices)
+
+        self._max_samples = max(int(max_samples or count), 2)
+        self._timestamps = np.zeros(self._max_samples, dtype=np.int64)
+        self._prices = np.zeros(self._max_samples, dtype=np.float64)
+        self._count = min(count, self._max_samples)
+        self._timestamps[:self._count] = timestamps[count - self._count:]
+        self._prices[:self._count] = prices[count - self._count:]
+        self._step = int(np.median(np.diff(self._timestamps[:self._count]))) if self._count > 1 else 0
+        self._version = 0
+        self._cache = dict()
+
+    @classmethod
+    def from_market_chart(cls, json_data):
+        points = np.asarray(json_data["prices"], dtype=np.float64).reshape(-1, 2)
+        points = points[~np.isnan(points[:, 1])]
+
+        return cls((points[:, 0] // 1000).astype(np.int64), points[:, 1])
+
+    @property
+    def count(self):
+        return self._count
+
+    @property
+    def step(self):
+        return self._step
+
+    @property
+    def prices(self):
+        return self._prices[:self._count]
+
+    @property
+    def last_price(self):
+        if not self._count:
+            return None
+
+        return float(self._prices[self._count - 1])
+
+    @property
+    def last_timestamp(self):
+        if not self._count:
+            return None
+
+        return int(self._timestamps[self._count - 1])
+
+    def append(self, timestamp, price):
+        self._version += 1
+
+        if self._count and timestamp - self._timestamps[self._count - 1] < self._step:
+            self._prices[self._count - 1] = price
+            return
+
+        if self._count == self._max_samples:
+            drop = max(self._max_samples // 4, 1)
+            self._timestamps[:-drop] = self._timestamps[drop:]
+            self._prices[:-drop] = self._prices[drop:]
+            self._count -= drop
+
+        self._timestamps[self._count] = timestamp
+        self._prices[self._count] = price
+        self._count += 1
+
+    def samples_for_minutes(self, minutes, default_samples):
+        if minutes is None or not self._step:
+            return min(default_samples, self._count)
+
+        return min(max(int(round((minutes * 60) / self._step)), 2), self._count)
+
+    def _cached(self, name, period, calc):
+        if self._cache.get("version") != self._version:
+            self._cache = {"version": self._version}
+
+        key = (name, period)
+        if key not in self._cache:
+            self._cache[key] = calc(period) if period >= 2 else None
+
+        return self._cache[key]
+
+    @staticmethod
+    def _exp_weighted_mean(values, alpha):
+        weights = np.power(1.0 - alpha, np.arange(len(values), dtype=np.float64)[::-1])
+        return float(np.dot(weights, values) / weights.sum())
+
+    def sma(self, period):
+        return self._cached("sma", period, lambda n: float(self.prices[-n:].mean()))
+
+    def ema(self, period):
+        return self._cached("ema", period, lambda n: self._exp_weighted_mean(self.prices, 2.0 / (n + 1)))
+
+    def rsi(self, period):
+        def calc(n):
+            diffs = np.diff(self.prices)
+            avg_gain = self._exp_weighted_mean(np.clip(diffs, 0, None), 1.0 / n)
+            avg_loss = self._exp_weighted_mean(np.clip(-diffs, 0, None), 1.0 / n)
+
+            if avg_loss == 0:
+                return 100.0
+
+            return 100.0 - (100.0 / (1.0 + (avg_gain / avg_loss)))
+
+        return self._cached("rsi", period, calc)
+
+    def bollinger_bands(self, period, deviations=2.0):
+        def calc(n):
+            window = self.prices[-n:]
+            mean, stddev = float(window.mean()), float(window.std())
+            return (mean + (deviations * stddev), mean - (deviations * stddev))
+
+        return self._cached("bollinger", period, calc)
+
+    def realised_volatility(self, period):
+        def calc(n):
+            returns = np.diff(np.log(self.prices[-(n + 1):]))
+
+            if len(returns) < 2 or not self._step:
+                return None
+
+            samples_per_year = (365 * DAY_SECONDS) / self._step
+            return float(returns.std(ddof=1) * np.sqrt(samples_per_year) * 100)
+
+        return self._cached("volatility", period, calc)
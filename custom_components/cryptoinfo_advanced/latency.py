@@ -0,0 +1,94 @@
+import asyncio
+import time
+from collections import deque
+
+import numpy as np
+
+from .const.const import (
+    _LOGGER,
+    DEFAULT_LATENCY_SAMPLES,
+    LATENCY_MIN_SAMPLES,
+)
+
+
+class CryptoInfoAdvLatencyTracker:
+    def __init__(self, max_samples=None):
+        self._samples = deque(maxlen=int(max_samples or DEFAULT_LATENCY_SAMPLES))
+
+    @property
+    def count(self):
+        return len(self._samples)
+
+    def add(self, seconds):
+        self._samples.append(float(seconds))
+
+    def percentile(self, percentile):
+        if len(self._samples) < LATENCY_MIN_SAMPLES:
+            return None
+
+        return float(np.percentile(np.fromiter(self._samples, dtype=np.float64), percentile))
+
+    def percentile_ms(self, percentile):
+        seconds = self.percentile(percentile)
+
+        return round(seconds * 1000, 1) if seconds is not None else None
+
+
+def _consume_exception(task):
+    # Keeps asyncio from logging the exception of a losing or cancelled request as never retrieved
+    if not task.cancelled() and task.exception() is not None:
+        _LOGGER.debug("Hedged request failed: %r", task.exception())
+
+
+def _task_result(task):
+    if task.cancelled() or task.exception() is not None:
+        return None
+
+    return task.result()
+
+
+# primary and alternate return None on failure, the alternate is only started once the primary is slower than
+# hedge_delay and the slower of the two is cancelled. Returns whether the alternate was used along with the result.
+async def async_hedged_call(primary, alternate, hedge_delay, primary_tracker=None, allow_hedge=None):
+    start = time.perf_counter()
+    primary_task = asyncio.ensure_future(primary())
+    primary_task.add_done_callback(_consume_exception)
+    alternate_task = None
+    pending = {primary_task}
+
+    def track_primary():
+        if primary_tracker is not None:
+            primary_tracker.add(time.perf_counter() - start)
+
+    try:
+        if hedge_delay is not None:
+            (done, pending) = await asyncio.wait(pending, timeout=hedge_delay)
+
+            if len(pending) and (allow_hedge is None or allow_hedge()):
+                alternate_task = asyncio.ensure_future(alternate())
+                alternate_task.add_done_callback(_consume_exception)
+                pending.add(alternate_task)
+
+        while len(pending):
+            (done, pending) = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+
+            for task in done:
+                if task is primary_task:
+                    track_primary()
+
+                if _task_result(task) is not None:
+                    return (task is alternate_task, task.result())
+
+        if alternate_task is None and _task_result(primary_task) is not None:
+            # Answered before the hedge delay
+            track_primary()
+            return (False, primary_task.result())
+
+        return (alternate_task is not None, None)
+    finally:
+        for task in pending:
+            # A cancelled primary still tells us it was at least this slow
+            if task is primary_task:
+                track_primary()
+
+            task.cancel()
@@ -1,8 +1,41 @@
+import aiohttp
+import asyncio
+import async_timeout
+import logging
 import time
+from datetime import timedelta
+
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
 from .const.const import (
+    _LOGGER,
+    DOMAIN,
+    CONF_HTTP_LIMIT_PER_HOST,
+    CONF_HTTP_DNS_CACHE_TTL,
+    CONF_HTTP_KEEPALIVE_TIMEOUT,
+    DEFAULT_HTTP_LIMIT_PER_HOST,
+    DEFAULT_HTTP_DNS_CACHE_TTL,
+    DEFAULT_HTTP_KEEPALIVE_TIMEOUT,
+    DEFAULT_SHARED_FETCH_CONCURRENCY,
+    HTTP_SESSION_DEDICATED,
+    LATENCY_REPORT_PERCENTILE,
+    PROVIDER_COINGECKO,
+    PROVIDER_CRYPTOID,
+    PROVIDER_MEMPOOL,
+    TIP_HEIGHT_PROBE_SECONDS,
+    TRAFFIC_MODE_REPLAY,
+    DAY_SECONDS,
+    DEPENDENCY_HASHRATE,
+    DEPENDENCY_BLOCK_TIME,
+    DEPENDENCY_HASH_CONTROL,
     PROPERTY_POOL_CONTROL_REMAINING,
 )
+from .history import CryptoInfoAdvOrphanSeries
+from .latency import CryptoInfoAdvLatencyTracker
+from .monitor import CryptoInfoAdvLoopMonitor
+from .providers import CryptoInfoAdvProvider
+from .traffic import CryptoInfoAdvTrafficLog
 
 
 class CryptoInfoAdvFetchProp:
@@ -70,6 +103,7 @@ class CryptoInfoAdvFetchProp:
 class CryptoInfoAdvDataFetchType:
     PRICE_MAIN = CryptoInfoAdvFetchProp("price_main")
     PRICE_SIMPLE = CryptoInfoAdvFetchProp("price_simple")
+    PRICE_HISTORY = CryptoInfoAdvFetchProp("price_history")
     DOMINANCE = CryptoInfoAdvFetchProp("dominance")
     CHAIN_SUMMARY = CryptoInfoAdvFetchProp("chain_summary")
     CHAIN_CONTROL = CryptoInfoAdvFetchProp("chain_control")
@@ -79,28 +113,125 @@ class CryptoInfoAdvDataFetchType:
     MEMPOOL_STATS = CryptoInfoAdvFetchProp("mempool_stats")
     MEMPOOL_FEES = CryptoInfoAdvFetchProp("mempool_fees")
     MEMPOOL_NEXT_BLOCK = CryptoInfoAdvFetchProp("mempool_next_block")
+    PORTFOLIO = CryptoInfoAdvFetchProp("portfolio")
 
 
-class CryptoInfoAdvEntityManager:
-    _instance = None
+class CryptoInfoAdvCoinAggregate:
+    def __init__(self):
+        self._hash_control = dict()
+        self._known_hash_control_100 = 0
+        self._known_hash_control_1000 = 0
+        self._hashrates = dict()
+        self._best_hashrate = None
+        self._best_hashrate_source = None
+        self._block_time = None
+        self._last_diff_height = None
+
+    @property
+    def remaining_hash_control(self):
+        if not len(self._hash_control):
+            return (None, None)
+
+        return (int(100 - self._known_hash_control_100), int(1000 - self._known_hash_control_1000))
+
+    @property
+    def best_hashrate(self):
+        return self._best_hashrate
+
+    @property
+    def best_hashrate_source(self):
+        return self._best_hashrate_source
+
+    @property
+    def block_time(self):
+        return self._block_time
+
+    @property
+    def last_diff_height(self):
+        return self._last_diff_height
+
+    def update_hash_control(self, source_id, control_100, control_1000):
+        old_control = self._hash_control.pop(source_id, None)
+        new_control = None
+
+        if old_control is not None:
+            self._known_hash_control_100 -= old_control[0]
+            self._known_hash_control_1000 -= old_control[1]
+
+        if control_100 is not None:
+            new_control = (int(control_100), int(control_1000) if control_1000 is not None else 0)
+            self._hash_control[source_id] = new_control
+            self._known_hash_control_100 += new_control[0]
+            self._known_hash_control_1000 += new_control[1]
+
+        return old_control != new_control
+
+    def update_hashrate(self, source_id, hashrate):
+        old_best = (self._best_hashrate, self._best_hashrate_source)
+
+        if hashrate is None:
+            self._hashrates.pop(source_id, None)
+        else:
+            self._hashrates[source_id] = hashrate
+
+        if hashrate is not None and (self._best_hashrate is None or hashrate >= self._best_hashrate):
+            self._best_hashrate, self._best_hashrate_source = hashrate, source_id
+
+        elif source_id == self._best_hashrate_source:
+            # The best source dropped, fall back to the next best of the few remaining sources
+            self._best_hashrate_source = max(self._hashrates, key=self._hashrates.get, default=None)
+            self._best_hashrate = self._hashrates.get(self._best_hashrate_source)
+
+        return old_best != (self._best_hashrate, self._best_hashrate_source)
+
+    def update_block_time(self, block_time):
+        changed = block_time != self._block_time
+        self._block_time = block_time
+        return changed
+
+    def update_last_diff_height(self, last_diff_height):
+        changed = last_diff_height != self._last_diff_height
+        self._last_diff_height = last_diff_height
+        return changed
 
+
+class CryptoInfoAdvEntityManager:
     def __init__(self):
+        self._hass = None
+        self._session = None
+        self._session_options = dict()
+        self._remove_close_listener = None
         self._entities = dict()
         self._child_entities = dict()
         self._api_data = dict()
         self._fetch_frequency = dict()
         self._last_fetch = dict()
         self._extra_sensor_types = list()
-        self._hashrate_sources = dict()
         self._block_time_sources = dict()
         self._last_diff_sources = dict()
-        self._hash_control_sources = dict()
+        self._coin_aggregates = dict()
+        self._dependents = dict()
+        self._data_key_consumers = dict()
+        self._tip_heights = dict()
+        self._tip_height_probes = dict()
+        self._data_key_tip_heights = dict()
+        self._fetch_locks = dict()
+        self._latest_prices = dict()
+        self._loop_monitor = None
+        self._traffic_log = None
+        self._latency_trackers = dict()
+        self._providers = dict()
+        self._portfolios = dict()
+        self._fetch_semaphore = None
+        self._price_series = dict()
+        self._orphan_series = dict()
 
     @property
     def fetch_types(self):
         return [
             CryptoInfoAdvDataFetchType.PRICE_MAIN,
             CryptoInfoAdvDataFetchType.PRICE_SIMPLE,
+            CryptoInfoAdvDataFetchType.PRICE_HISTORY,
             CryptoInfoAdvDataFetchType.DOMINANCE,
             CryptoInfoAdvDataFetchType.CHAIN_SUMMARY,
             CryptoInfoAdvDataFetchType.CHAIN_CONTROL,
@@ -110,6 +241,7 @@ class CryptoInfoAdvEntityManager:
             CryptoInfoAdvDataFetchType.MEMPOOL_STATS,
             CryptoInfoAdvDataFetchType.MEMPOOL_FEES,
             CryptoInfoAdvDataFetchType.MEMPOOL_NEXT_BLOCK,
+            CryptoInfoAdvDataFetchType.PORTFOLIO,
         ]
 
     @property
@@ -157,9 +289,30 @@ class CryptoInfoAdvEntityManager:
     @property
     def fetch_shared_types(self):
         return [
+            CryptoInfoAdvDataFetchType.PRICE_HISTORY,
             CryptoInfoAdvDataFetchType.DOMINANCE,
             CryptoInfoAdvDataFetchType.CHAIN_SUMMARY,
             CryptoInfoAdvDataFetchType.CHAIN_CONTROL,
+            CryptoInfoAdvDataFetchType.CHAIN_ORPHANS,
+            CryptoInfoAdvDataFetchType.NOMP_POOL_STATS,
+        ]
+
+    def is_shared_entity(self, entity):
+        return entity.fetch_type in self.fetch_shared_types or entity.is_currency_group
+
+    @property
+    def fetch_executor_unsafe_types(self):
+        # Their extractors merge into series owned by the manager, so they have to run on the event loop
+        return [
+            CryptoInfoAdvDataFetchType.PRICE_HISTORY,
+            CryptoInfoAdvDataFetchType.CHAIN_ORPHANS,
+        ]
+
+    @property
+    def fetch_block_gated_types(self):
+        return [
+            CryptoInfoAdvDataFetchType.CHAIN_SUMMARY,
+            CryptoInfoAdvDataFetchType.CHAIN_CONTROL,
         ]
 
     @property
@@ -190,10 +343,137 @@ class CryptoInfoAdvEntityManager:
         return CryptoInfoAdvDataFetchType.PRICE_MAIN
 
     @classmethod
-    def instance(cls):
-        if cls._instance is None:
-            cls._instance = cls()
-        return cls._instance
+    def instance(cls, hass):
+        # Entities built without hass only use the stateless lookups, so they get a throwaway manager
+        if hass is None:
+            return cls()
+
+        if DOMAIN not in hass.data:
+            hass.data[DOMAIN] = cls()
+            hass.data[DOMAIN]._hass = hass
+
+        return hass.data[DOMAIN]
+
+    def configure_session(self, session_options):
+        for (key, value) in session_options.items():
+            if value is None:
+                continue
+
+            if self._session_options.get(key, value) != value:
+                _LOGGER.warning("Dedicated HTTP session already uses %s %s, ignoring %s",
+                                key, self._session_options[key], value)
+                continue
+
+            if key not in self._session_options and self._session is not None and not self._session.closed:
+                _LOGGER.warning("Dedicated HTTP session is already open, %s %s applies after a reload", key, value)
+
+            self._session_options[key] = value
+
+    def build_session_connector(self):
+        return aiohttp.TCPConnector(
+            limit_per_host=self._session_options.get(CONF_HTTP_LIMIT_PER_HOST, DEFAULT_HTTP_LIMIT_PER_HOST),
+            ttl_dns_cache=self._session_options.get(CONF_HTTP_DNS_CACHE_TTL, DEFAULT_HTTP_DNS_CACHE_TTL),
+            keepalive_timeout=self._session_options.get(CONF_HTTP_KEEPALIVE_TIMEOUT, DEFAULT_HTTP_KEEPALIVE_TIMEOUT),
+            enable_cleanup_closed=True,
+        )
+
+    def get_session(self, hass):
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(connector=self.build_session_connector())
+
+            session = self._session
+
+            async def _async_close_session(event):
+                await session.close()
+
+            self._remove_close_listener = hass.bus.async_listen_once(EVENT_HOMEASSISTANT_CLOSE, _async_close_session)
+
+        return self._session
+
+    def get_entity_session(self, hass, http_session):
+        if hass is None:
+            return None
+
+        if http_session == HTTP_SESSION_DEDICATED:
+            return self.get_session(hass)
+
+        return async_get_clientsession(hass)
+
+    async def async_api_get(self, session, url, request_timeout, provider=None, encoding="utf-8"):
+        resp_text = None
+        start = time.perf_counter()
+
+        async with async_timeout.timeout(request_timeout):
+            if self._traffic_log is not None:
+                resp_text = await self._traffic_log.async_get(session, url, encoding)
+            else:
+                response = await session.get(url)
+                if response.status == 200:
+                    resp_text = await response.text(encoding=encoding)
+
+        if provider is not None:
+            provider.record_request(time.perf_counter() - start if resp_text is not None else None)
+
+            if not provider.is_default and _LOGGER.isEnabledFor(logging.DEBUG):
+                _LOGGER.debug("Latency p%s of %r: %s ms", LATENCY_REPORT_PERCENTILE, provider,
+                              provider.latency.percentile_ms(LATENCY_REPORT_PERCENTILE))
+
+        return resp_text
+
+    @property
+    def loop_monitor(self):
+        return self._loop_monitor
+
+    def enable_loop_monitor(self, hass, threshold_ms):
+        if self._loop_monitor is None or threshold_ms < self._loop_monitor.threshold_ms:
+            if self._loop_monitor is not None:
+                self._loop_monitor.stop()
+
+            self._loop_monitor = CryptoInfoAdvLoopMonitor(hass, threshold_ms)
+            self._loop_monitor.start()
+
+        return self._loop_monitor
+
+    @property
+    def traffic_log(self):
+        return self._traffic_log
+
+    async def async_enable_traffic_log(self, hass, mode, path, timing_scale):
+        if self._traffic_log is not None:
+            if self._traffic_log.mode != mode or self._traffic_log.path != path:
+                _LOGGER.warning("Traffic %s to %s is already enabled, ignoring %s to %s",
+                                self._traffic_log.mode, self._traffic_log.path, mode, path)
+
+            return self._traffic_log
+
+        self._traffic_log = CryptoInfoAdvTrafficLog(hass, mode, path, timing_scale)
+
+        if mode == TRAFFIC_MODE_REPLAY:
+            count = await hass.async_add_executor_job(self._traffic_log.load)
+            _LOGGER.info("Replaying %s recorded responses from %s", count, path)
+
+        return self._traffic_log
+
+    def _release(self):
+        if self._loop_monitor is not None:
+            self._loop_monitor.stop()
+            self._loop_monitor = None
+
+        if self._traffic_log is not None:
+            self._traffic_log.close()
+            self._traffic_log = None
+
+        if self._session is not None and self._hass is not None:
+            self._hass.async_create_task(self._session.close())
+            self._session = None
+
+        # Otherwise every reload leaves a listener holding on to a closed session
+        if self._remove_close_listener is not None:
+            self._remove_close_listener()
+            self._remove_close_listener = None
+
+        if self._hass is not None and self._hass.data.get(DOMAIN) is self:
+            del self._hass.data[DOMAIN]
 
     def add_entities(self, entities):
         for entity in entities:
@@ -203,106 +483,255 @@ class CryptoInfoAdvEntityManager:
 
                 entity_data_key = self.get_entity_data_key(entity)
 
-                current_frequency = self._fetch_frequency.get(entity_data_key)
+                if entity_data_key not in self._data_key_consumers:
+                    self._data_key_consumers[entity_data_key] = set()
 
-                if current_frequency is None or entity.update_frequency < current_frequency:
-                    self._fetch_frequency[entity_data_key] = entity.update_frequency
+                self._data_key_consumers[entity_data_key].add(entity.unique_id)
+
+                current_frequency = self._fetch_frequency.get(entity_data_key)
 
-                if entity.fetch_type in self.fetch_hashrate_types:
-                    if entity.cryptocurrency_name not in self._hashrate_sources:
-                        self._hashrate_sources[entity.cryptocurrency_name] = dict()
+                if entity.fetch_type == CryptoInfoAdvDataFetchType.PRICE_HISTORY:
+                    self._fetch_frequency[entity_data_key] = timedelta(seconds=DAY_SECONDS)
 
-                    self._hashrate_sources[entity.cryptocurrency_name][entity.fetch_type] = entity.unique_id
+                elif current_frequency is None or entity.update_frequency < current_frequency:
+                    self._fetch_frequency[entity_data_key] = entity.update_frequency
 
                 if entity.fetch_type == CryptoInfoAdvDataFetchType.CHAIN_BLOCK_TIME:
                     self._block_time_sources[entity.cryptocurrency_name] = entity.unique_id
 
                 if entity.fetch_type == CryptoInfoAdvDataFetchType.CHAIN_SUMMARY:
                     self._last_diff_sources[entity.cryptocurrency_name] = entity.unique_id
+                    self.add_dependent(entity, DEPENDENCY_HASHRATE)
+                    self.add_dependent(entity, DEPENDENCY_BLOCK_TIME)
 
-                if entity.fetch_type == CryptoInfoAdvDataFetchType.CHAIN_CONTROL:
-                    if entity.cryptocurrency_name not in self._hash_control_sources:
-                        self._hash_control_sources[entity.cryptocurrency_name] = set()
-                    if PROPERTY_POOL_CONTROL_REMAINING not in entity.pool_prefixes:
-                        self._hash_control_sources[entity.cryptocurrency_name].add(entity.unique_id)
+                if entity.fetch_type == CryptoInfoAdvDataFetchType.CHAIN_CONTROL and not self.is_hash_control_source(entity):
+                    self.add_dependent(entity, DEPENDENCY_HASH_CONTROL)
             else:
                 self._child_entities[entity.unique_id] = entity
 
+    def _evict_data_key(self, entity, entity_data_key):
+        self._data_key_consumers.pop(entity_data_key, None)
+        self._api_data.pop(entity_data_key, None)
+        self._last_fetch.pop(entity_data_key, None)
+        self._fetch_frequency.pop(entity_data_key, None)
+        self._data_key_tip_heights.pop(entity_data_key, None)
+        self._fetch_locks.pop(entity_data_key, None)
+
+        if entity.fetch_type == CryptoInfoAdvDataFetchType.PRICE_HISTORY:
+            self._price_series.pop(f"{entity.cryptocurrency_name}_{entity.currency_name}", None)
+
+        if entity.fetch_type == CryptoInfoAdvDataFetchType.CHAIN_ORPHANS:
+            self._orphan_series.pop(entity.cryptocurrency_name, None)
+
+    def remove_entity(self, entity):
+        if entity.is_child_sensor:
+            self._child_entities.pop(entity.unique_id, None)
+
+        elif self._entities.get(entity.unique_id) is entity:
+            del self._entities[entity.unique_id]
+
+            for dependents in self._dependents.values():
+                dependents.discard(entity.unique_id)
+
+            for sources in [self._block_time_sources, self._last_diff_sources]:
+                if sources.get(entity.cryptocurrency_name) == entity.unique_id:
+                    del sources[entity.cryptocurrency_name]
+
+            entity_data_key = self.get_entity_data_key(entity)
+            consumers = self._data_key_consumers.get(entity_data_key, set())
+            consumers.discard(entity.unique_id)
+
+            if not len(consumers):
+                self._evict_data_key(entity, entity_data_key)
+
+            elif entity.fetch_type != CryptoInfoAdvDataFetchType.PRICE_HISTORY:
+                self._fetch_frequency[entity_data_key] = min(
+                    self._entities[entity_id].update_frequency for entity_id in consumers
+                )
+
+            self.clear_entity_aggregates(entity)
+
+            if not len(self._entities) and not len(self._portfolios):
+                self._release()
+
+    def add_portfolio(self, portfolio_entity):
+        self._portfolios[portfolio_entity.unique_id] = portfolio_entity
+
+    def remove_portfolio(self, portfolio_entity):
+        if self._portfolios.get(portfolio_entity.unique_id) is portfolio_entity:
+            del self._portfolios[portfolio_entity.unique_id]
+
+        if not len(self._entities) and not len(self._portfolios):
+            self._release()
+
+    def get_fetch_lock(self, entity):
+        entity_data_key = self.get_entity_data_key(entity)
+
+        if entity_data_key not in self._fetch_locks:
+            self._fetch_locks[entity_data_key] = asyncio.Lock()
+
+        return self._fetch_locks[entity_data_key]
+
+    @property
+    def fetch_semaphore(self):
+        if self._fetch_semaphore is None:
+            self._fetch_semaphore = asyncio.Semaphore(DEFAULT_SHARED_FETCH_CONCURRENCY)
+
+        return self._fetch_semaphore
+
     def get_last_fetch(self, fetch_type):
         return self._last_fetch.get(fetch_type, 0)
 
     def get_fetch_frequency(self, fetch_type):
         tdelta = self._fetch_frequency.get(fetch_type)
-        return tdelta.seconds if tdelta else 0
+        return int(tdelta.total_seconds()) if tdelta else 0
 
-    def get_remaining_hash_control(self, cryptocurrency_name):
-        if cryptocurrency_name not in self._hash_control_sources:
-            return (None, None)
+    def get_rate_budget_interval(self, entity):
+        if entity.fetch_type not in self.fetch_price_types or entity.provider is None or entity.provider.rate_budget is None:
+            return 0
 
-        sensor_found = False
-        known_hash_control_100 = 0
-        known_hash_control_1000 = 0
+        price_data_keys = set(
+            self.get_entity_data_key(e) if self.is_shared_entity(e) else e.unique_id
+            for e in self._entities.values()
+            if e.fetch_type in self.fetch_price_types and e.provider is entity.provider
+        )
 
-        for entity_id in self._hash_control_sources[cryptocurrency_name]:
-            source = self._entities[entity_id]
+        return (60 * len(price_data_keys)) / entity.provider.rate_budget
 
-            if source.state is None:
-                continue
+    @property
+    def fetch_type_providers(self):
+        return {
+            CryptoInfoAdvDataFetchType.PRICE_MAIN: PROVIDER_COINGECKO,
+            CryptoInfoAdvDataFetchType.PRICE_SIMPLE: PROVIDER_COINGECKO,
+            CryptoInfoAdvDataFetchType.PRICE_HISTORY: PROVIDER_COINGECKO,
+            CryptoInfoAdvDataFetchType.DOMINANCE: PROVIDER_COINGECKO,
+            CryptoInfoAdvDataFetchType.CHAIN_SUMMARY: PROVIDER_CRYPTOID,
+            CryptoInfoAdvDataFetchType.CHAIN_CONTROL: PROVIDER_CRYPTOID,
+            CryptoInfoAdvDataFetchType.CHAIN_ORPHANS: PROVIDER_CRYPTOID,
+            CryptoInfoAdvDataFetchType.CHAIN_BLOCK_TIME: PROVIDER_CRYPTOID,
+            CryptoInfoAdvDataFetchType.MEMPOOL_STATS: PROVIDER_MEMPOOL,
+            CryptoInfoAdvDataFetchType.MEMPOOL_FEES: PROVIDER_MEMPOOL,
+            CryptoInfoAdvDataFetchType.MEMPOOL_NEXT_BLOCK: PROVIDER_MEMPOOL,
+            CryptoInfoAdvDataFetchType.PORTFOLIO: PROVIDER_COINGECKO,
+        }
+
+    def get_provider(self, name, base_url=None):
+        if name is None:
+            return None
 
-            sensor_found = True
+        provider_key = (name, CryptoInfoAdvProvider.resolve_base_url(name, base_url))
 
-            known_hash_control_100 += int(source.state)
+        if provider_key not in self._providers:
+            self._providers[provider_key] = CryptoInfoAdvProvider(name, base_url)
 
-            if source._pool_control_1000b is not None:
-                known_hash_control_1000 += int(source._pool_control_1000b)
+        return self._providers[provider_key]
 
-        if not sensor_found:
-            return (None, None)
+    def get_fetch_type_provider(self, fetch_type, base_url=None):
+        return self.get_provider(self.fetch_type_providers.get(fetch_type), base_url)
 
-        return (int(100 - known_hash_control_100), int(1000 - known_hash_control_1000))
+    @property
+    def providers(self):
+        return list(self._providers.values())
 
-    def get_best_hashrate(self, cryptocurrency_name):
-        if cryptocurrency_name not in self._hashrate_sources:
-            return None
+    def get_latency_tracker(self, key):
+        if key not in self._latency_trackers:
+            self._latency_trackers[key] = CryptoInfoAdvLatencyTracker()
 
-        hashrates = list()
-        for t, entity_id in self._hashrate_sources[cryptocurrency_name].items():
+        return self._latency_trackers[key]
 
-            source = self._entities[entity_id]
+    def get_coin_aggregate(self, cryptocurrency_name):
+        if cryptocurrency_name not in self._coin_aggregates:
+            self._coin_aggregates[cryptocurrency_name] = CryptoInfoAdvCoinAggregate()
 
-            if source.hashrate is not None:
-                hashrates.append(source.hashrate)
+        return self._coin_aggregates[cryptocurrency_name]
 
-        return max(hashrates)
+    def is_hash_control_source(self, entity):
+        return (
+            entity.fetch_type == CryptoInfoAdvDataFetchType.CHAIN_CONTROL
+            and PROPERTY_POOL_CONTROL_REMAINING not in entity.pool_prefixes
+        )
 
-    def get_block_time(self, cryptocurrency_name):
-        if cryptocurrency_name not in self._block_time_sources:
-            return None
+    def add_dependent(self, entity, dependency):
+        dependency_key = (entity.cryptocurrency_name, dependency)
 
-        entity_id = self._block_time_sources[cryptocurrency_name]
+        if dependency_key not in self._dependents:
+            self._dependents[dependency_key] = set()
 
-        source = self._entities[entity_id]
+        self._dependents[dependency_key].add(entity.unique_id)
 
-        if source.state is not None:
-            return source.state
+    def _recompute_dependents(self, source, changed_dependencies):
+        dependent_ids = set()
 
-        return None
+        for dependency in changed_dependencies:
+            dependent_ids.update(self._dependents.get((source.cryptocurrency_name, dependency), set()))
 
-    def get_last_diff(self, cryptocurrency_name):
-        if cryptocurrency_name not in self._last_diff_sources:
-            return None
+        dependent_ids.discard(source.unique_id)
 
-        entity_id = self._last_diff_sources[cryptocurrency_name]
+        for entity_id in dependent_ids:
+            dependent = self._entities.get(entity_id)
 
-        source = self._entities[entity_id]
+            if dependent is not None:
+                dependent.recompute_dependencies()
+
+    def update_entity_aggregates(self, entity):
+        if entity.is_child_sensor:
+            return
 
-        if source.difficulty_previous_target_height is not None:
-            return source.difficulty_previous_target_height
+        aggregate = self.get_coin_aggregate(entity.cryptocurrency_name)
+        changed_dependencies = set()
 
-        return None
+        if entity.fetch_type in self.fetch_hashrate_types:
+            if aggregate.update_hashrate(entity.unique_id, entity.hashrate):
+                changed_dependencies.add(DEPENDENCY_HASHRATE)
+
+        if self.is_hash_control_source(entity):
+            if aggregate.update_hash_control(entity.unique_id, entity.state, entity.pool_control_1000b):
+                changed_dependencies.add(DEPENDENCY_HASH_CONTROL)
+
+        if self._block_time_sources.get(entity.cryptocurrency_name) == entity.unique_id:
+            if aggregate.update_block_time(entity.state):
+                changed_dependencies.add(DEPENDENCY_BLOCK_TIME)
+
+        if self._last_diff_sources.get(entity.cryptocurrency_name) == entity.unique_id:
+            aggregate.update_last_diff_height(entity.difficulty_previous_target_height)
+
+        if len(changed_dependencies):
+            self._recompute_dependents(entity, changed_dependencies)
+
+    def clear_entity_aggregates(self, entity):
+        aggregate = self._coin_aggregates.get(entity.cryptocurrency_name)
+
+        if aggregate is None:
+            return
+
+        changed_dependencies = set()
+
+        if aggregate.update_hashrate(entity.unique_id, None):
+            changed_dependencies.add(DEPENDENCY_HASHRATE)
+
+        if aggregate.update_hash_control(entity.unique_id, None, None):
+            changed_dependencies.add(DEPENDENCY_HASH_CONTROL)
+
+        if len(changed_dependencies):
+            self._recompute_dependents(entity, changed_dependencies)
+
+        if not any(e.cryptocurrency_name == entity.cryptocurrency_name for e in self._entities.values()):
+            del self._coin_aggregates[entity.cryptocurrency_name]
+
+    def get_remaining_hash_control(self, cryptocurrency_name):
+        return self.get_coin_aggregate(cryptocurrency_name).remaining_hash_control
+
+    def get_best_hashrate(self, cryptocurrency_name):
+        return self.get_coin_aggregate(cryptocurrency_name).best_hashrate
+
+    def get_block_time(self, cryptocurrency_name):
+        return self.get_coin_aggregate(cryptocurrency_name).block_time
+
+    def get_last_diff(self, cryptocurrency_name):
+        return self.get_coin_aggregate(cryptocurrency_name).last_diff_height
 
     def should_fetch_entity(self, entity):
-        if entity.fetch_type not in self.fetch_shared_types:
+        if not self.is_shared_entity(entity):
             return True
 
         entity_data_key = self.get_entity_data_key(entity)
@@ -314,25 +743,100 @@ class CryptoInfoAdvEntityManager:
             return True
 
         last_fetch = self.get_last_fetch(entity_data_key)
+        tip_height = self._tip_heights.get(entity.cryptocurrency_name)
+
+        if entity.block_gating and tip_height is not None:
+            if self._data_key_tip_heights.get(entity_data_key, dict()).get(entity.cryptocurrency_name) != tip_height:
+                return True
+
+            return last_fetch + entity.block_gating_max_staleness.total_seconds() < int(time.time())
+
         if last_fetch + self.get_fetch_frequency(entity_data_key) < int(time.time()):
             return True
 
         return False
 
+    def should_probe_tip_height(self, cryptocurrency_name):
+        if self._tip_height_probes.get(cryptocurrency_name, 0) + TIP_HEIGHT_PROBE_SECONDS > int(time.time()):
+            return False
+
+        self._tip_height_probes[cryptocurrency_name] = int(time.time())
+        return True
+
+    def set_tip_height(self, cryptocurrency_name, tip_height):
+        self._tip_heights[cryptocurrency_name] = tip_height
+
+    def get_tip_height_provider(self, entity):
+        # A sensor pointed at its own API probes it as well
+        if not entity.provider.is_default or entity.cryptocurrency_name.lower() not in ['btc', 'bitcoin']:
+            return entity.provider
+
+        # Otherwise a self-hosted mempool instance used by any sensor is preferred over the public one
+        for provider in self._providers.values():
+            if provider.name == PROVIDER_MEMPOOL and not provider.is_default:
+                return provider
+
+        return self.get_provider(PROVIDER_MEMPOOL)
+
+    def get_price_series(self, cryptocurrency_name, currency_name):
+        return self._price_series.get(f"{cryptocurrency_name}_{currency_name}")
+
+    def set_price_series(self, cryptocurrency_name, currency_name, price_series):
+        self._price_series[f"{cryptocurrency_name}_{currency_name}"] = price_series
+
+    def append_price_history(self, cryptocurrency_name, currency_name, price):
+        price_series = self.get_price_series(cryptocurrency_name, currency_name)
+
+        if price_series is not None:
+            price_series.append(int(time.time()), float(price))
+
+    def set_latest_price(self, cryptocurrency_name, currency_name, price):
+        self._latest_prices[f"{cryptocurrency_name}_{currency_name}"] = float(price)
+
+        for portfolio_entity in self._portfolios.values():
+            portfolio_entity.on_price_update(cryptocurrency_name, currency_name, float(price))
+
+    def get_latest_price(self, cryptocurrency_name, currency_name):
+        return self._latest_prices.get(f"{cryptocurrency_name}_{currency_name}")
+
+    def get_orphan_series(self, cryptocurrency_name):
+        if cryptocurrency_name not in self._orphan_series:
+            self._orphan_series[cryptocurrency_name] = CryptoInfoAdvOrphanSeries()
+
+        return self._orphan_series[cryptocurrency_name]
+
     def get_entity_data_key(self, entity):
-        if entity.fetch_type == CryptoInfoAdvDataFetchType.CHAIN_CONTROL:
+        entity_data_key = self._get_provider_data_key(entity)
+
+        # Sensors of the same type on different endpoints never share data
+        if entity.provider is not None and not entity.provider.is_default:
+            return f"{entity_data_key}_{entity.provider.base_url}"
+
+        return entity_data_key
+
+    def _get_provider_data_key(self, entity):
+        if entity.fetch_type in [CryptoInfoAdvDataFetchType.CHAIN_CONTROL, CryptoInfoAdvDataFetchType.CHAIN_ORPHANS]:
             return f"{entity.fetch_type}_{entity.cryptocurrency_name}"
+        elif entity.fetch_type == CryptoInfoAdvDataFetchType.PRICE_HISTORY:
+            return f"{entity.fetch_type}_{entity.cryptocurrency_name}_{entity.currency_name}"
+        elif entity.fetch_type == CryptoInfoAdvDataFetchType.NOMP_POOL_STATS:
+            return f"{entity.fetch_type}_{entity.api_domain_name}"
+        elif entity.is_currency_group:
+            return f"{entity.fetch_type}_{entity.cryptocurrency_name}_{'_'.join(entity.currency_group)}"
         else:
             return f"{entity.fetch_type}"
 
     def set_cached_entity_data(self, entity, data):
-        if entity.fetch_type not in self.fetch_shared_types:
+        # Only called for data fetched from the API, reapplying cached data must not make it look fresh
+        if not self.is_shared_entity(entity):
             return
 
         entity_data_key = self.get_entity_data_key(entity)
 
         self._api_data[entity_data_key] = data
         self._last_fetch[entity_data_key] = int(time.time())
+        # Shared chain data such as the summary covers every coin, so the tip of each is kept
+        self._data_key_tip_heights[entity_data_key] = dict(self._tip_heights)
 
     def fetch_cached_entity_data(self, entity):
         entity_data_key = self.get_entity_data_key(entity)
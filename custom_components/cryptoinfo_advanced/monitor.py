@@ -0,0 +1,98 @@
+import functools
+import time
+from contextlib import contextmanager
+
+from .const.const import (
+    _LOGGER,
+    EVENT_SLOW_SECTION,
+    LOOP_MONITOR_PROBE_SECONDS,
+)
+
+
+class CryptoInfoAdvLoopMonitor:
+    def __init__(self, hass, threshold_ms):
+        self._hass = hass
+        self._threshold = threshold_ms / 1000
+        self._probe_handle = None
+        self._probe_expected = None
+        self._max_lag = 0.0
+        self._last_slow_section = None
+
+    @property
+    def threshold_ms(self):
+        return self._threshold * 1000
+
+    @property
+    def max_lag_ms(self):
+        return self._max_lag * 1000
+
+    def start(self):
+        if self._probe_handle is None:
+            self._schedule_probe()
+
+    def stop(self):
+        if self._probe_handle is not None:
+            self._probe_handle.cancel()
+            self._probe_handle = None
+
+    def _schedule_probe(self):
+        self._probe_expected = self._hass.loop.time() + LOOP_MONITOR_PROBE_SECONDS
+        self._probe_handle = self._hass.loop.call_at(self._probe_expected, self._probe)
+
+    def _probe(self):
+        lag = self._hass.loop.time() - self._probe_expected
+        self._max_lag = max(self._max_lag, lag)
+
+        if lag > self._threshold:
+            _LOGGER.warning(
+                "Event loop lag of %.1f ms, last slow cryptoinfo section: %s",
+                lag * 1000, self._last_slow_section or "none",
+            )
+
+        self._last_slow_section = None
+        self._schedule_probe()
+
+    @contextmanager
+    def section(self, entity, section):
+        start = time.perf_counter()
+
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - start
+
+            if duration > self._threshold:
+                self._report(entity, section, duration)
+
+    def _report(self, entity, section, duration):
+        entity_id = getattr(entity, "entity_id", None) or entity.unique_id
+        self._last_slow_section = f"{section} in {entity_id} ({entity.fetch_type})"
+
+        _LOGGER.warning(
+            "Cryptoinfo %s of %s (%s) blocked the event loop for %.1f ms",
+            section, entity_id, entity.fetch_type, duration * 1000,
+        )
+
+        self._hass.bus.async_fire(EVENT_SLOW_SECTION, {
+            "entity_id": entity_id,
+            "fetch_type": str(entity.fetch_type),
+            "section": section,
+            "duration_ms": round(duration * 1000, 3),
+        })
+
+
+def timed_section(section):
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(entity, *args, **kwargs):
+            loop_monitor = entity.loop_monitor
+
+            if loop_monitor is None:
+                return func(entity, *args, **kwargs)
+
+            with loop_monitor.section(entity, section):
+                return func(entity, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
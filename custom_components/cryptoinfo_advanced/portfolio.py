@@ -0,0 +1,103 @@
+import numpy as np
+
+
+class CryptoInfoAdvPortfolio:
+    def __init__(self, holdings):
+        # Holdings of the same coin in the same wallet are merged into one position
+        amounts = dict()
+        for cryptocurrency_name, wallet, amount in holdings:
+            amounts[(cryptocurrency_name, wallet)] = amounts.get((cryptocurrency_name, wallet), 0.0) + float(amount)
+
+        self._positions = list(amounts.keys())
+        self._coins = sorted(set(coin for coin, wallet in self._positions))
+        self._wallets = sorted(set(wallet for coin, wallet in self._positions))
+        self._coin_lookup = {coin: i for i, coin in enumerate(self._coins)}
+        wallet_lookup = {wallet: i for i, wallet in enumerate(self._wallets)}
+
+        self._coin_index = np.array([self._coin_lookup[coin] for coin, wallet in self._positions], dtype=np.intp)
+        self._wallet_index = np.array([wallet_lookup[wallet] for coin, wallet in self._positions], dtype=np.intp)
+        self._amounts = np.array(list(amounts.values()), dtype=np.float64)
+        self._prices = np.full(len(self._coins), np.nan)
+
+        self._values = np.full(len(self._positions), np.nan)
+        self._allocations = np.full(len(self._positions), np.nan)
+        self._coin_values = np.zeros(len(self._coins))
+        self._wallet_values = np.zeros(len(self._wallets))
+        self._total = None
+        self._version = 0
+        self._computed_version = None
+
+    @property
+    def positions(self):
+        return self._positions
+
+    @property
+    def coins(self):
+        return self._coins
+
+    @property
+    def total(self):
+        return self._total
+
+    @property
+    def missing_prices(self):
+        return [coin for coin, price in zip(self._coins, self._prices) if np.isnan(price)]
+
+    def set_price(self, cryptocurrency_name, price):
+        coin_index = self._coin_lookup.get(cryptocurrency_name)
+
+        if coin_index is None or self._prices[coin_index] == price:
+            return False
+
+        self._prices[coin_index] = price
+        self._version += 1
+
+        return True
+
+    def compute(self):
+        if self._computed_version == self._version:
+            return False
+
+        position_prices = self._prices[self._coin_index]
+        self._values = self._amounts * position_prices
+        known_values = np.nan_to_num(self._values)
+
+        total = float(known_values.sum())
+        self._coin_values = np.bincount(self._coin_index, weights=known_values, minlength=len(self._coins))
+        self._wallet_values = np.bincount(self._wallet_index, weights=known_values, minlength=len(self._wallets))
+        self._allocations = (self._values / total) * 100 if total else np.full(len(self._positions), np.nan)
+        self._total = total if not np.isnan(position_prices).all() else None
+        self._computed_version = self._version
+
+        return True
+
+    @staticmethod
+    def _optional(value):
+        return None if np.isnan(value) else float(value)
+
+    def position_amount(self, position_index):
+        return float(self._amounts[position_index])
+
+    def position_price(self, position_index):
+        return self._optional(self._prices[self._coin_index[position_index]])
+
+    def position_value(self, position_index):
+        return self._optional(self._values[position_index])
+
+    def position_allocation(self, position_index):
+        return self._optional(self._allocations[position_index])
+
+    @property
+    def coin_values(self):
+        return {coin: float(value) for coin, value in zip(self._coins, self._coin_values)}
+
+    @property
+    def coin_allocations(self):
+        if not self._total:
+            return {coin: None for coin in self._coins}
+
+        return {coin: float(value / self._total) * 100 for coin, value in zip(self._coins, self._coin_values)}
+
+    @property
+    def wallet_values(self):
+        return {wallet: float(value) for wallet, value in zip(self._wallets, self._wallet_values)}
@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+Portfolio sensor component for Cryptoinfo Advanced
+Author: TheHoliestRoger
+"""
+
+import aiohttp
+import asyncio
+import json
+from datetime import datetime, timedelta
+
+from .const.const import (
+    _LOGGER,
+    SENSOR_PREFIX,
+    ATTR_LAST_UPDATE,
+    ATTR_PORTFOLIO_AMOUNT,
+    ATTR_PORTFOLIO_PRICE,
+    ATTR_PORTFOLIO_ALLOCATION,
+    ATTR_PORTFOLIO_COIN_VALUES,
+    ATTR_PORTFOLIO_COIN_ALLOCATIONS,
+    ATTR_PORTFOLIO_WALLET_VALUES,
+    ATTR_PORTFOLIO_MISSING_PRICES,
+    API_ENDPOINT_PRICE_ALT,
+    DEFAULT_REQUEST_TIMEOUT,
+    LOOP_SECTION_PROPERTY_UPDATE,
+)
+from .manager import CryptoInfoAdvEntityManager, CryptoInfoAdvDataFetchType
+from .monitor import timed_section
+from .portfolio import CryptoInfoAdvPortfolio
+
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorStateClass,
+)
+from homeassistant.util import Throttle
+
+
+class CryptoinfoAdvPortfolioSensor(SensorEntity):
+    def __init__(
+        self,
+        hass,
+        currency_name,
+        unit_of_measurement,
+        update_frequency,
+        id_name,
+        unique_id,
+        state_class,
+        holdings,
+        http_session=None,
+        request_timeout=None,
+        api_base_url=None,
+    ):
+        # Internal Properties
+        self.hass = hass
+        self.currency_name = currency_name
+        self._session = CryptoInfoAdvEntityManager.instance(hass).get_entity_session(hass, http_session)
+        self._request_timeout = float(request_timeout) if request_timeout is not None else DEFAULT_REQUEST_TIMEOUT
+        self._update_frequency = update_frequency if isinstance(update_frequency, timedelta) else timedelta(minutes=1)
+        self._internal_id_name = id_name if id_name is not None else ""
+        self._portfolio = CryptoInfoAdvPortfolio(holdings)
+        self._provider = CryptoInfoAdvEntityManager.instance(self.hass).get_fetch_type_provider(
+            CryptoInfoAdvDataFetchType.PORTFOLIO, api_base_url
+        )
+        self._recompute_handle = None
+        self._last_update = None
+
+        # HASS Attributes
+        self.async_update = Throttle(self._update_frequency)(self._async_update)
+        self._name = SENSOR_PREFIX + (
+            self._internal_id_name if len(self._internal_id_name) > 0 else f"Portfolio {self.currency_name.upper()}"
+        )
+        self._attr_unique_id = unique_id if unique_id is not None and len(unique_id) else self._build_unique_id()
+        self._attr_device_class = SensorDeviceClass.MONETARY
+        self._attr_state_class = state_class or SensorStateClass.TOTAL
+        self._attr_available = True
+        self._unit_of_measurement = unit_of_measurement
+        self._icon = "mdi:wallet"
+        self._state = None
+
+        self._position_sensors = [
+            CryptoinfoAdvPortfolioPositionSensor(self, position_index)
+            for position_index in range(len(self._portfolio.positions))
+        ]
+
+    @property
+    def portfolio(self):
+        return self._portfolio
+
+    @property
+    def fetch_type(self):
+        return CryptoInfoAdvDataFetchType.PORTFOLIO
+
+    @property
+    def loop_monitor(self):
+        return CryptoInfoAdvEntityManager.instance(self.hass).loop_monitor
+
+    @property
+    def position_sensors(self):
+        return self._position_sensors
+
+    @property
+    def name(self):
+        return self._name
+
+    @property
+    def unique_id(self):
+        return self._attr_unique_id
+
+    @property
+    def available(self):
+        return self._attr_available
+
+    @property
+    def icon(self):
+        return self._icon
+
+    @property
+    def unit_of_measurement(self):
+        return self._unit_of_measurement
+
+    @property
+    def state(self):
+        return self._state
+
+    @property
+    def extra_state_attributes(self):
+        return {
+            ATTR_LAST_UPDATE: self._last_update,
+            ATTR_PORTFOLIO_COIN_VALUES: self._portfolio.coin_values,
+            ATTR_PORTFOLIO_COIN_ALLOCATIONS: self._portfolio.coin_allocations,
+            ATTR_PORTFOLIO_WALLET_VALUES: self._portfolio.wallet_values,
+            ATTR_PORTFOLIO_MISSING_PRICES: self._portfolio.missing_prices,
+        }
+
+    def _build_unique_id(self):
+        return "portfolio{0}{1}".format(self.currency_name, "".join(self._portfolio.coins))
+
+    def on_price_update(self, cryptocurrency_name, currency_name, price):
+        if currency_name != self.currency_name:
+            return
+
+        if self._portfolio.set_price(cryptocurrency_name, price):
+            self._schedule_recompute()
+
+    def _schedule_recompute(self):
+        # Several price sensors refreshing together only cause a single computation
+        if self._recompute_handle is not None or self.hass is None:
+            return
+
+        self._recompute_handle = self.hass.loop.call_soon(self._recompute)
+
+    @timed_section(LOOP_SECTION_PROPERTY_UPDATE)
+    def _recompute(self):
+        self._recompute_handle = None
+
+        if not self._portfolio.compute():
+            return
+
+        self._state = round(self._portfolio.total, 8) if self._portfolio.total is not None else None
+        self._last_update = datetime.today().strftime("%d-%m-%Y %H:%M")
+        self._write_state()
+
+        for position_sensor in self._position_sensors:
+            position_sensor.update_from_portfolio()
+
+    def _write_state(self):
+        if self.hass is not None and self.entity_id is not None:
+            self.async_write_ha_state()
+
+    async def _async_fetch_missing_prices(self, cryptocurrency_names):
+        url = self._provider.build_url(API_ENDPOINT_PRICE_ALT, ",".join(cryptocurrency_names), self.currency_name)
+
+        try:
+            resp_text = await CryptoInfoAdvEntityManager.instance(self.hass).async_api_get(
+                self._session, url, self._request_timeout, self._provider
+            )
+
+            if resp_text is None:
+                return
+
+            json_data = json.loads(resp_text)
+        except asyncio.TimeoutError:
+            _LOGGER.error("Timeout fetching prices for %s", self.name)
+            return
+        except aiohttp.ClientError as err:
+            _LOGGER.error("Error fetching prices for %s: %r", self.name, err)
+            return
+        except ValueError as err:
+            _LOGGER.error("Error decoding prices for %s: %r", self.name, err)
+            return
+
+        for cryptocurrency_name in cryptocurrency_names:
+            price = json_data.get(cryptocurrency_name, {}).get(self.currency_name)
+
+            if price is not None:
+                CryptoInfoAdvEntityManager.instance(self.hass).set_latest_price(cryptocurrency_name, self.currency_name, price)
+
+    async def _async_update(self):
+        for cryptocurrency_name in self._portfolio.missing_prices:
+            price = CryptoInfoAdvEntityManager.instance(self.hass).get_latest_price(cryptocurrency_name, self.currency_name)
+
+            if price is not None:
+                self._portfolio.set_price(cryptocurrency_name, price)
+
+        # Coins without a price sensor of their own are fetched in a single request
+        missing_prices = self._portfolio.missing_prices
+        if len(missing_prices):
+            await self._async_fetch_missing_prices(missing_prices)
+
+        self._recompute()
+
+    async def async_added_to_hass(self):
+        await super().async_added_to_hass()
+        CryptoInfoAdvEntityManager.instance(self.hass).add_portfolio(self)
+
+    async def async_will_remove_from_hass(self):
+        if self._recompute_handle is not None:
+            self._recompute_handle.cancel()
+            self._recompute_handle = None
+
+        CryptoInfoAdvEntityManager.instance(self.hass).remove_portfolio(self)
+
+
+class CryptoinfoAdvPortfolioPositionSensor(SensorEntity):
+    def __init__(self, portfolio_sensor, position_index):
+        self._portfolio_sensor = portfolio_sensor
+        self._position_index = position_index
+        (self.cryptocurrency_name, self._wallet) = portfolio_sensor.portfolio.positions[position_index]
+
+        # HASS Attributes
+        self._attr_should_poll = False
+        self._name = " ".join(filter(None, [
+            portfolio_sensor.name, self.cryptocurrency_name.title(), self._wallet,
+        ]))
+        self._attr_unique_id = "_".join(filter(None, [
+            portfolio_sensor.unique_id, self.cryptocurrency_name, self._wallet,
+        ]))
+        self._attr_device_class = SensorDeviceClass.MONETARY
+        self._attr_state_class = SensorStateClass.TOTAL
+        self._unit_of_measurement = portfolio_sensor.unit_of_measurement
+        self._icon = "mdi:bitcoin"
+        self._state = None
+        self._price = None
+        self._allocation = None
+
+    @property
+    def name(self):
+        return self._name
+
+    @property
+    def unique_id(self):
+        return self._attr_unique_id
+
+    @property
+    def icon(self):
+        return self._icon
+
+    @property
+    def unit_of_measurement(self):
+        return self._unit_of_measurement
+
+    @property
+    def state(self):
+        return self._state
+
+    @property
+    def extra_state_attributes(self):
+        return {
+            ATTR_PORTFOLIO_AMOUNT: self._portfolio_sensor.portfolio.position_amount(self._position_index),
+            ATTR_PORTFOLIO_PRICE: self._price,
+            ATTR_PORTFOLIO_ALLOCATION: self._allocation,
+        }
+
+    def update_from_portfolio(self):
+        portfolio = self._portfolio_sensor.portfolio
+        value = portfolio.position_value(self._position_index)
+        state = round(value, 8) if value is not None else None
+        allocation = portfolio.position_allocation(self._position_index)
+        allocation = round(allocation, 4) if allocation is not None else None
+
+        if state == self._state and allocation == self._allocation:
+            return
+
+        self._state = state
+        self._price = portfolio.position_price(self._position_index)
+        self._allocation = allocation
+
+        if self.hass is not None and self.entity_id is not None:
+            self.async_write_ha_state()
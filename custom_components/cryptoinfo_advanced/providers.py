@@ -0,0 +1,74 @@
+import time
+from collections import deque
+
+from .const.const import (
+    PROVIDER_BASE_URLS,
+    PROVIDER_RATE_BUDGETS,
+)
+from .latency import CryptoInfoAdvLatencyTracker
+
+
+class CryptoInfoAdvProvider:
+    def __init__(self, name, base_url=None):
+        self._name = name
+        self._base_url = self.resolve_base_url(name, base_url)
+        self._is_default = self._base_url == PROVIDER_BASE_URLS.get(name)
+        # Self-hosted endpoints are not rate limited
+        self._rate_budget = PROVIDER_RATE_BUDGETS.get(name) if self._is_default else None
+        self._rate_window = deque()
+        self._latency = CryptoInfoAdvLatencyTracker()
+
+    @staticmethod
+    def resolve_base_url(name, base_url):
+        if not base_url:
+            return PROVIDER_BASE_URLS.get(name)
+
+        return base_url if base_url.endswith("/") else f"{base_url}/"
+
+    @property
+    def name(self):
+        return self._name
+
+    @property
+    def base_url(self):
+        return self._base_url
+
+    @property
+    def is_default(self):
+        return self._is_default
+
+    @property
+    def rate_budget(self):
+        return self._rate_budget
+
+    @property
+    def latency(self):
+        return self._latency
+
+    def build_url(self, endpoint, *args):
+        return endpoint.format(self._base_url, *args)
+
+    def _prune_rate_window(self):
+        window_start = time.time() - 60
+
+        while len(self._rate_window) and self._rate_window[0] < window_start:
+            self._rate_window.popleft()
+
+    def record_request(self, elapsed=None):
+        if elapsed is not None:
+            self._latency.add(elapsed)
+
+        if self._rate_budget is not None:
+            self._prune_rate_window()
+            self._rate_window.append(time.time())
+
+    def has_rate_budget(self):
+        if self._rate_budget is None:
+            return True
+
+        self._prune_rate_window()
+
+        return len(self._rate_window) < self._rate_budget
+
+    def __repr__(self):
+        return f"{self._name} ({self._base_url})"
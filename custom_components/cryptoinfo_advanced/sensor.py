@@ -9,6 +9,7 @@ from datetime import timedelta
 
 from .const.const import (
     _LOGGER,
+    DEFAULT_UNIT_OF_MEASUREMENT,
     DEFAULT_MAX_FETCH_FAILURES,
     DOMAIN,
     PLATFORMS,
@@ -28,10 +29,66 @@ from .const.const import (
     CONF_DIFFICULTY_WINDOW,
     CONF_HALVING_WINDOW,
     CONF_MAX_FETCH_FAILURES,
+    CONF_DEADBAND_ABSOLUTE,
+    CONF_DEADBAND_RELATIVE,
+    CONF_MIN_WRITE_INTERVAL,
+    CONF_HISTORY_SIZE,
+    CONF_EXTRA_SENSOR_WINDOW,
+    CONF_EXTRA_SENSOR_TARGET,
+    CONF_HISTORY_DAYS,
+    CONF_HTTP_SESSION,
+    CONF_REQUEST_TIMEOUT,
+    CONF_HTTP_LIMIT_PER_HOST,
+    CONF_HTTP_DNS_CACHE_TTL,
+    CONF_HTTP_KEEPALIVE_TIMEOUT,
+    CONF_ADAPTIVE_POLLING,
+    CONF_ADAPTIVE_MIN_FREQUENCY,
+    CONF_ADAPTIVE_MAX_FREQUENCY,
+    CONF_ADAPTIVE_THRESHOLD,
+    CONF_BLOCK_GATING,
+    CONF_BLOCK_GATING_MAX_STALENESS,
+    CONF_HOLDINGS,
+    CONF_HOLDING_AMOUNT,
+    CONF_HOLDING_WALLET,
+    CONF_LOOP_MONITOR,
+    CONF_EXECUTOR_THRESHOLD,
+    CONF_LOOP_MONITOR_THRESHOLD,
+    CONF_TRAFFIC_MODE,
+    CONF_TRAFFIC_FILE,
+    CONF_TRAFFIC_TIMING_SCALE,
+    CONF_SERVE_STALE,
+    CONF_MAX_STALENESS,
+    CONF_HEDGE_REQUESTS,
+    CONF_HEDGE_PERCENTILE,
+    CONF_API_BASE_URL,
+    DEFAULT_DEADBAND_ABSOLUTE,
+    DEFAULT_DEADBAND_RELATIVE,
+    DEFAULT_MIN_WRITE_INTERVAL,
+    DEFAULT_HISTORY_SIZE,
+    DEFAULT_HISTORY_DAYS,
+    DEFAULT_HTTP_SESSION,
+    DEFAULT_REQUEST_TIMEOUT,
+    DEFAULT_ADAPTIVE_MIN_FREQUENCY,
+    DEFAULT_ADAPTIVE_MAX_FREQUENCY,
+    DEFAULT_ADAPTIVE_THRESHOLD,
+    DEFAULT_BLOCK_GATING_MAX_STALENESS,
+    DEFAULT_LOOP_MONITOR_THRESHOLD,
+    DEFAULT_EXECUTOR_THRESHOLD,
+    DEFAULT_TRAFFIC_MODE,
+    DEFAULT_TRAFFIC_FILE,
+    DEFAULT_TRAFFIC_TIMING_SCALE,
+    DEFAULT_MAX_STALENESS,
+    DEFAULT_HEDGE_PERCENTILE,
+    HTTP_SESSION_SHARED,
+    HTTP_SESSION_DEDICATED,
+    TRAFFIC_MODE_OFF,
+    TRAFFIC_MODE_RECORD,
+    TRAFFIC_MODE_REPLAY,
 )
 
 from .manager import CryptoInfoAdvEntityManager, CryptoInfoAdvDataFetchType
 from .crypto_sensor import CryptoinfoAdvSensor
+from .portfolio_sensor import CryptoinfoAdvPortfolioSensor
 
 from homeassistant.components.sensor import (
     CONF_STATE_CLASS,
@@ -57,8 +114,8 @@ async def async_setup_platform(hass, config, async_add_entities, discovery_info=
     unique_id = config.get(CONF_UNIQUE_ID)
     state_class = config.get(CONF_STATE_CLASS)
     cryptocurrency_name = config.get(CONF_CRYPTOCURRENCY_NAME).lower().strip()
-    currency_name = config.get(CONF_CURRENCY_NAME).lower().strip()
-    unit_of_measurement = config.get(CONF_UNIT_OF_MEASUREMENT).strip()
+    currency_names = list(dict.fromkeys(c.lower().strip() for c in config.get(CONF_CURRENCY_NAME)))
+    unit_of_measurement = config.get(CONF_UNIT_OF_MEASUREMENT, "").strip()
     multiplier = config.get(CONF_MULTIPLIER).strip()
     update_frequency = timedelta(minutes=(float(config.get(CONF_UPDATE_FREQUENCY))))
     api_mode = config.get(CONF_API_MODE).lower().strip()
@@ -72,48 +129,158 @@ async def async_setup_platform(hass, config, async_add_entities, discovery_info=
     difficulty_window = config.get(CONF_DIFFICULTY_WINDOW)
     halving_window = config.get(CONF_HALVING_WINDOW)
     max_fetch_failures = config.get(CONF_MAX_FETCH_FAILURES)
+    deadband_absolute = config.get(CONF_DEADBAND_ABSOLUTE)
+    deadband_relative = config.get(CONF_DEADBAND_RELATIVE)
+    min_write_interval = timedelta(minutes=config.get(CONF_MIN_WRITE_INTERVAL))
+    history_size = config.get(CONF_HISTORY_SIZE)
+    history_days = config.get(CONF_HISTORY_DAYS)
+    http_session = config.get(CONF_HTTP_SESSION)
+    request_timeout = config.get(CONF_REQUEST_TIMEOUT)
+    adaptive_polling = config.get(CONF_ADAPTIVE_POLLING)
+    adaptive_min_frequency = timedelta(minutes=config.get(CONF_ADAPTIVE_MIN_FREQUENCY))
+    adaptive_max_frequency = timedelta(minutes=config.get(CONF_ADAPTIVE_MAX_FREQUENCY))
+    adaptive_threshold = config.get(CONF_ADAPTIVE_THRESHOLD)
+    block_gating = config.get(CONF_BLOCK_GATING)
+    block_gating_max_staleness = timedelta(minutes=config.get(CONF_BLOCK_GATING_MAX_STALENESS))
+    executor_threshold = config.get(CONF_EXECUTOR_THRESHOLD)
+    serve_stale = config.get(CONF_SERVE_STALE)
+    max_staleness = timedelta(minutes=config.get(CONF_MAX_STALENESS))
+    hedge_requests = config.get(CONF_HEDGE_REQUESTS)
+    hedge_percentile = config.get(CONF_HEDGE_PERCENTILE)
+    api_base_url = config.get(CONF_API_BASE_URL).strip()
 
     entities = []
 
-    try:
-        new_sensor = CryptoinfoAdvSensor(
+    if config.get(CONF_LOOP_MONITOR):
+        CryptoInfoAdvEntityManager.instance(hass).enable_loop_monitor(hass, config.get(CONF_LOOP_MONITOR_THRESHOLD))
+
+    if http_session == HTTP_SESSION_DEDICATED:
+        # Has to happen before the first sensor opens the session
+        CryptoInfoAdvEntityManager.instance(hass).configure_session({
+            CONF_HTTP_LIMIT_PER_HOST: config.get(CONF_HTTP_LIMIT_PER_HOST),
+            CONF_HTTP_DNS_CACHE_TTL: config.get(CONF_HTTP_DNS_CACHE_TTL),
+            CONF_HTTP_KEEPALIVE_TIMEOUT: config.get(CONF_HTTP_KEEPALIVE_TIMEOUT),
+        })
+
+    if config.get(CONF_TRAFFIC_MODE) != TRAFFIC_MODE_OFF:
+        await CryptoInfoAdvEntityManager.instance(hass).async_enable_traffic_log(
             hass,
-            cryptocurrency_name,
-            currency_name,
-            unit_of_measurement,
-            multiplier,
+            config.get(CONF_TRAFFIC_MODE),
+            hass.config.path(config.get(CONF_TRAFFIC_FILE)),
+            config.get(CONF_TRAFFIC_TIMING_SCALE),
+        )
+
+    fetch_type = CryptoInfoAdvEntityManager.instance(hass).get_fetch_type_from_str(api_mode)
+
+    if fetch_type == CryptoInfoAdvDataFetchType.PORTFOLIO:
+        holdings = config.get(CONF_HOLDINGS, [])
+
+        if not len(holdings):
+            _LOGGER.error(f"No holdings supplied for portfolio {id_name or unique_id}")
+            return False
+
+        if len(currency_names) > 1:
+            _LOGGER.error(f"A portfolio is valued in a single currency, got {', '.join(currency_names)} for {id_name or unique_id}")
+            return False
+
+        portfolio_sensor = CryptoinfoAdvPortfolioSensor(
+            hass,
+            currency_names[0],
+            unit_of_measurement or DEFAULT_UNIT_OF_MEASUREMENT,
             update_frequency,
             id_name,
             unique_id,
             state_class,
-            api_mode,
-            pool_prefix,
-            fetch_args,
-            extra_sensors,
-            api_domain_name,
-            pool_name,
-            diff_multiplier,
-            block_time_minutes,
-            difficulty_window,
-            halving_window,
-            max_fetch_failures,
+            [
+                (
+                    holding[CONF_CRYPTOCURRENCY_NAME].lower().strip(),
+                    holding[CONF_HOLDING_WALLET].strip(),
+                    holding[CONF_HOLDING_AMOUNT],
+                )
+                for holding in holdings
+            ],
+            http_session,
+            request_timeout,
+            api_base_url,
         )
-        if new_sensor.check_valid_config(False):
-            entities.append(new_sensor)
-            entities.extend(new_sensor.init_child_sensors())
+
+        async_add_entities([portfolio_sensor] + portfolio_sensor.position_sensors)
+        return False
+
+    price_types = CryptoInfoAdvEntityManager.instance(hass).fetch_price_types
+
+    # Only price sensors can be fanned out per currency, the price modes also share one request
+    if fetch_type not in price_types + [CryptoInfoAdvDataFetchType.PRICE_HISTORY]:
+        currency_names = currency_names[:1]
+
+    currency_group = currency_names if fetch_type in price_types else None
+
+    try:
+        for currency_name in currency_names:
+            is_fan_out = len(currency_names) > 1
+            # Fanned out sensors fall back to their currency instead of the shared default
+            currency_unit = currency_name.upper() if is_fan_out else DEFAULT_UNIT_OF_MEASUREMENT
+            new_sensor = CryptoinfoAdvSensor(
+                hass,
+                cryptocurrency_name,
+                currency_name,
+                unit_of_measurement or currency_unit,
+                multiplier,
+                update_frequency,
+                f"{id_name} {currency_name.upper()}" if is_fan_out and id_name else id_name,
+                f"{unique_id}_{currency_name}" if is_fan_out and unique_id else unique_id,
+                state_class,
+                api_mode,
+                pool_prefix,
+                fetch_args,
+                extra_sensors,
+                api_domain_name,
+                pool_name,
+                diff_multiplier,
+                block_time_minutes,
+                difficulty_window,
+                halving_window,
+                max_fetch_failures,
+                deadband_absolute,
+                deadband_relative,
+                min_write_interval,
+                history_size,
+                history_days,
+                http_session,
+                request_timeout,
+                adaptive_polling,
+                adaptive_min_frequency,
+                adaptive_max_frequency,
+                adaptive_threshold,
+                block_gating,
+                block_gating_max_staleness,
+                currency_group,
+                executor_threshold,
+                serve_stale,
+                max_staleness,
+                hedge_requests,
+                hedge_percentile,
+                api_base_url,
+            )
+            if new_sensor.check_valid_config(False):
+                entities.append(new_sensor)
+                entities.extend(new_sensor.init_child_sensors())
     except Exception as error:
         _LOGGER.error(f"{type(error).__name__}: {error}")
         return False
 
     async_add_entities(entities)
-    CryptoInfoAdvEntityManager.instance().add_entities(entities)
+    CryptoInfoAdvEntityManager.instance(hass).add_entities(entities)
 
 
 PLATFORM_SCHEMA = PLATFORM_SCHEMA.extend(
     {
         vol.Required(CONF_CRYPTOCURRENCY_NAME, default="bitcoin"): cv.string,
-        vol.Required(CONF_CURRENCY_NAME, default="usd"): cv.string,
-        vol.Optional(CONF_UNIT_OF_MEASUREMENT, default="$"): cv.string,
+        vol.Required(CONF_CURRENCY_NAME, default=["usd"]): vol.All(
+            cv.ensure_list,
+            [cv.string],
+        ),
+        vol.Optional(CONF_UNIT_OF_MEASUREMENT): cv.string,
         vol.Required(CONF_MULTIPLIER, default=1): cv.string,
         vol.Required(CONF_UPDATE_FREQUENCY, default=60): cv.string,
         vol.Optional(CONF_ID, default=""): cv.string,
@@ -122,12 +289,43 @@ PLATFORM_SCHEMA = PLATFORM_SCHEMA.extend(
         vol.Optional(
             CONF_API_MODE,
             default=str(CryptoInfoAdvDataFetchType.PRICE_MAIN)
-        ): vol.In(CryptoInfoAdvEntityManager.instance().fetch_types),
+        ): vol.In(CryptoInfoAdvEntityManager.instance(None).fetch_types),
         vol.Optional(CONF_POOL_PREFIX, default=[""]): vol.All(
             cv.ensure_list,
             [cv.string],
         ),
         vol.Optional(CONF_MAX_FETCH_FAILURES, default=DEFAULT_MAX_FETCH_FAILURES): cv.positive_int,
+        vol.Optional(CONF_DEADBAND_ABSOLUTE, default=DEFAULT_DEADBAND_ABSOLUTE): cv.positive_float,
+        vol.Optional(CONF_DEADBAND_RELATIVE, default=DEFAULT_DEADBAND_RELATIVE): cv.positive_float,
+        vol.Optional(CONF_MIN_WRITE_INTERVAL, default=DEFAULT_MIN_WRITE_INTERVAL): cv.positive_float,
+        vol.Optional(CONF_HISTORY_SIZE, default=DEFAULT_HISTORY_SIZE): cv.positive_int,
+        vol.Optional(CONF_HISTORY_DAYS, default=DEFAULT_HISTORY_DAYS): cv.positive_int,
+        vol.Optional(CONF_HTTP_SESSION, default=DEFAULT_HTTP_SESSION): vol.In([HTTP_SESSION_SHARED, HTTP_SESSION_DEDICATED]),
+        vol.Optional(CONF_REQUEST_TIMEOUT, default=DEFAULT_REQUEST_TIMEOUT): cv.positive_float,
+        vol.Optional(CONF_HTTP_LIMIT_PER_HOST): cv.positive_int,
+        vol.Optional(CONF_HTTP_DNS_CACHE_TTL): cv.positive_int,
+        vol.Optional(CONF_HTTP_KEEPALIVE_TIMEOUT): cv.positive_float,
+        vol.Optional(CONF_ADAPTIVE_POLLING, default=False): cv.boolean,
+        vol.Optional(CONF_ADAPTIVE_MIN_FREQUENCY, default=DEFAULT_ADAPTIVE_MIN_FREQUENCY): cv.positive_float,
+        vol.Optional(CONF_ADAPTIVE_MAX_FREQUENCY, default=DEFAULT_ADAPTIVE_MAX_FREQUENCY): cv.positive_float,
+        vol.Optional(CONF_ADAPTIVE_THRESHOLD, default=DEFAULT_ADAPTIVE_THRESHOLD): cv.positive_float,
+        vol.Optional(CONF_BLOCK_GATING, default=False): cv.boolean,
+        vol.Optional(CONF_BLOCK_GATING_MAX_STALENESS, default=DEFAULT_BLOCK_GATING_MAX_STALENESS): cv.positive_float,
+        vol.Optional(CONF_LOOP_MONITOR, default=False): cv.boolean,
+        vol.Optional(CONF_EXECUTOR_THRESHOLD, default=DEFAULT_EXECUTOR_THRESHOLD): cv.positive_int,
+        vol.Optional(CONF_SERVE_STALE, default=False): cv.boolean,
+        vol.Optional(CONF_MAX_STALENESS, default=DEFAULT_MAX_STALENESS): cv.positive_float,
+        vol.Optional(CONF_HEDGE_REQUESTS, default=False): cv.boolean,
+        vol.Optional(CONF_API_BASE_URL, default=""): cv.string,
+        vol.Optional(CONF_HEDGE_PERCENTILE, default=DEFAULT_HEDGE_PERCENTILE): vol.All(
+            vol.Coerce(float), vol.Range(min=1, max=99)
+        ),
+        vol.Optional(CONF_LOOP_MONITOR_THRESHOLD, default=DEFAULT_LOOP_MONITOR_THRESHOLD): cv.positive_float,
+        vol.Optional(CONF_TRAFFIC_MODE, default=DEFAULT_TRAFFIC_MODE): vol.In(
+            [TRAFFIC_MODE_OFF, TRAFFIC_MODE_RECORD, TRAFFIC_MODE_REPLAY]
+        ),
+        vol.Optional(CONF_TRAFFIC_FILE, default=DEFAULT_TRAFFIC_FILE): cv.string,
+        vol.Optional(CONF_TRAFFIC_TIMING_SCALE, default=DEFAULT_TRAFFIC_TIMING_SCALE): cv.positive_float,
         vol.Optional(CONF_FETCH_ARGS, default=""): cv.string,
         vol.Optional(CONF_EXTRA_SENSORS): vol.All(
             cv.ensure_list,
@@ -139,6 +337,23 @@ PLATFORM_SCHEMA = PLATFORM_SCHEMA.extend(
                         vol.Optional(CONF_STATE_CLASS): STATE_CLASSES_SCHEMA,
                         vol.Required(CONF_EXTRA_SENSOR_PROPERTY): vol.In(CryptoinfoAdvSensor.get_valid_extra_sensor_keys()),
                         vol.Optional(CONF_UNIT_OF_MEASUREMENT, default="$"): cv.string,
+                        vol.Optional(CONF_DEADBAND_ABSOLUTE): cv.positive_float,
+                        vol.Optional(CONF_DEADBAND_RELATIVE): cv.positive_float,
+                        vol.Optional(CONF_MIN_WRITE_INTERVAL): cv.positive_float,
+                        vol.Optional(CONF_EXTRA_SENSOR_WINDOW): cv.positive_float,
+                        vol.Optional(CONF_EXTRA_SENSOR_TARGET): cv.positive_float,
+                    }
+                )
+            ],
+        ),
+        vol.Optional(CONF_HOLDINGS): vol.All(
+            cv.ensure_list,
+            [
+                vol.Schema(
+                    {
+                        vol.Required(CONF_CRYPTOCURRENCY_NAME): cv.string,
+                        vol.Required(CONF_HOLDING_AMOUNT): vol.Coerce(float),
+                        vol.Optional(CONF_HOLDING_WALLET, default=""): cv.string,
                     }
                 )
             ],
@@ -0,0 +1,124 @@
+import asyncio
+import json
+import os
+import threading
+import time
+
+import aiohttp
+
+from .const.const import (
+    _LOGGER,
+    TRAFFIC_MODE_RECORD,
+    TRAFFIC_MODE_REPLAY,
+)
+
+
+class CryptoInfoAdvTrafficLog:
+    def __init__(self, hass, mode, path, timing_scale=1.0):
+        self._hass = hass
+        self._mode = mode
+        self._path = path
+        self._timing_scale = timing_scale
+        self._pending_lines = list()
+        self._flush_lines = list()
+        self._flush_task = None
+        self._write_lock = threading.Lock()
+        self._replay_entries = dict()
+        self._replay_positions = dict()
+
+    @property
+    def mode(self):
+        return self._mode
+
+    @property
+    def path(self):
+        return self._path
+
+    def load(self):
+        # Runs in the executor, the whole recording is kept in memory keyed by URL
+        self._replay_entries = dict()
+        self._replay_positions = dict()
+
+        if not os.path.isfile(self._path):
+            _LOGGER.warning("No recorded traffic found at %s", self._path)
+            return 0
+
+        count = 0
+        with open(self._path, encoding="utf-8") as traffic_file:
+            for line in traffic_file:
+                if not line.strip():
+                    continue
+
+                entry = json.loads(line)
+                self._replay_entries.setdefault(entry["url"], list()).append(entry)
+                count = count + 1
+
+        return count
+
+    async def async_get(self, session, url, encoding="utf-8"):
+        if self._mode == TRAFFIC_MODE_REPLAY:
+            return await self._async_replay(url)
+
+        start = time.perf_counter()
+        response = await session.get(url)
+        body = await response.text(encoding=encoding) if response.status == 200 else None
+        elapsed = time.perf_counter() - start
+
+        if self._mode == TRAFFIC_MODE_RECORD:
+            self._record(url, response.status, dict(response.headers), elapsed, body)
+
+        return body
+
+    async def _async_replay(self, url):
+        entries = self._replay_entries.get(url)
+
+        if not entries:
+            raise aiohttp.ClientError(f"No recorded response for {url}")
+
+        # Responses for the same URL are served in recorded order and start over once exhausted
+        position = self._replay_positions.get(url, 0)
+        self._replay_positions[url] = (position + 1) % len(entries)
+        entry = entries[position]
+
+        if self._timing_scale > 0:
+            await asyncio.sleep(entry["elapsed"] * self._timing_scale)
+
+        return entry["body"] if entry["status"] == 200 else None
+
+    def _record(self, url, status, headers, elapsed, body):
+        self._pending_lines.append(json.dumps({
+            "time": round(time.time(), 3),
+            "url": url,
+            "status": status,
+            "headers": headers,
+            "elapsed": round(elapsed, 4),
+            "body": body,
+        }, separators=(",", ":")))
+
+        if self._flush_task is None:
+            self._flush_task = self._hass.async_create_task(self._async_flush())
+
+    async def _async_flush(self):
+        try:
+            while len(self._pending_lines):
+                self._flush_lines = self._pending_lines
+                self._pending_lines = list()
+                await self._hass.async_add_executor_job(self._append, self._flush_lines)
+        finally:
+            self._flush_task = None
+
+    def _append(self, lines):
+        # A batch is emptied once written, so close() and a late executor job never write it twice
+        with self._write_lock:
+            if not len(lines):
+                return
+
+            with open(self._path, "a", encoding="utf-8") as traffic_file:
+                traffic_file.write("\n".join(lines) + "\n")
+
+            lines.clear()
+
+    def close(self):
+        # The batch of a running flush goes first, then the lines queued since, so a shutdown loses none of them
+        self._append(self._flush_lines)
+        self._append(self._pending_lines)
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Executor offload benchmark for Cryptoinfo Advanced
+
+Decodes a synthetic CryptoID pools document and builds the pool index either
+inline on the event loop or in the default executor, while a ticker measures
+how long the loop was blocked.
+
+    python scripts/executor_benchmark.py --pools 20000 --rounds 20
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "custom_components"))
+
+from cryptoinfo_advanced.indexes import CryptoInfoAdvPoolIndex  # noqa: E402
+
+TICK_SECONDS = 0.001
+
+
+def build_document(pool_count):
+    return json.dumps({"pools": [
+        {"name": f"pool-{i:06d}", "nb100": i % 7, "nb1000": i % 71, "url": f"https://pool{i}.example", "tags": ["a", "b"]}
+        for i in range(pool_count)
+    ]})
+
+
+def decode_and_extract(resp_text):
+    return CryptoInfoAdvPoolIndex(json.loads(resp_text)["pools"])
+
+
+async def measure(resp_text, rounds, offload):
+    loop = asyncio.get_running_loop()
+    gaps = list()
+    running = True
+
+    async def ticker():
+        last = loop.time()
+        while running:
+            await asyncio.sleep(TICK_SECONDS)
+            now = loop.time()
+            gaps.append(max(now - last - TICK_SECONDS, 0.0))
+            last = now
+
+    ticker_task = loop.create_task(ticker())
+    await asyncio.sleep(0.05)
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        if offload:
+            await loop.run_in_executor(None, decode_and_extract, resp_text)
+        else:
+            decode_and_extract(resp_text)
+            await asyncio.sleep(0)
+    elapsed = time.perf_counter() - start
+
+    running = False
+    await ticker_task
+
+    return {
+        "mode": "executor" if offload else "inline",
+        "rounds": rounds,
+        "max_block_ms": round(max(gaps) * 1000, 2),
+        "total_block_ms": round(sum(gap for gap in gaps if gap > TICK_SECONDS) * 1000, 2),
+        "elapsed_ms": round(elapsed * 1000, 2),
+    }
+
+
+async def main(pool_count, rounds):
+    resp_text = build_document(pool_count)
+    print(f"document size: {len(resp_text) / 1024:.0f} KiB")
+
+    for offload in [False, True]:
+        print(await measure(resp_text, rounds, offload))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pools", type=int, default=20000)
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    asyncio.run(main(args.pools, args.rounds))
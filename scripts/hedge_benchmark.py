@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Hedged request benchmark for Cryptoinfo Advanced
+
+Simulates a markets endpoint with a heavy latency tail and a simple price
+endpoint, then reports the latency percentiles of sequential price fetches
+without and with hedging along with the share of extra requests issued.
+
+    python scripts/hedge_benchmark.py --requests 2000 --slow-share 0.05
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "custom_components"))
+
+from cryptoinfo_advanced.latency import CryptoInfoAdvLatencyTracker, async_hedged_call  # noqa: E402
+
+TIME_SCALE = 0.01
+
+
+def simulated_latency(median, slow_share, slow_latency):
+    if random.random() < slow_share:
+        return random.uniform(*slow_latency)
+
+    return random.lognormvariate(np.log(median), 0.3)
+
+
+async def simulated_get(latency):
+    await asyncio.sleep(latency * TIME_SCALE)
+    return "{}"
+
+
+async def measure(args, hedge):
+    loop = asyncio.get_running_loop()
+    random.seed(args.seed)
+    primary_tracker = CryptoInfoAdvLatencyTracker()
+    latencies = list()
+    hedges = 0
+
+    def allow_hedge():
+        nonlocal hedges
+        hedges = hedges + 1
+        return True
+
+    for _ in range(args.requests):
+        primary_latency = simulated_latency(args.primary_median, args.slow_share, (args.slow_min, args.slow_max))
+        alternate_latency = simulated_latency(args.alternate_median, args.slow_share, (args.slow_min, args.slow_max))
+        start = loop.time()
+
+        await async_hedged_call(
+            lambda: simulated_get(primary_latency),
+            lambda: simulated_get(alternate_latency),
+            primary_tracker.percentile(args.percentile) if hedge else None,
+            primary_tracker=primary_tracker,
+            allow_hedge=allow_hedge,
+        )
+
+        latencies.append((loop.time() - start) / TIME_SCALE)
+
+    latencies = np.asarray(latencies)
+
+    return {
+        "mode": "hedged" if hedge else "primary only",
+        "p50_s": round(float(np.percentile(latencies, 50)), 3),
+        "p95_s": round(float(np.percentile(latencies, 95)), 3),
+        "p99_s": round(float(np.percentile(latencies, 99)), 3),
+        "max_s": round(float(latencies.max()), 3),
+        "extra_requests": f"{hedges / args.requests:.1%}",
+    }
+
+
+async def main(args):
+    for hedge in [False, True]:
+        print(await measure(args, hedge))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--percentile", type=float, default=95.0)
+    parser.add_argument("--primary-median", type=float, default=0.4, help="seconds")
+    parser.add_argument("--alternate-median", type=float, default=0.3, help="seconds")
+    parser.add_argument("--slow-share", type=float, default=0.05, help="share of requests in the slow tail")
+    parser.add_argument("--slow-min", type=float, default=3.0, help="seconds")
+    parser.add_argument("--slow-max", type=float, default=30.0, help="seconds")
+    parser.add_argument("--seed", type=int, default=1)
+
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Reload soak test for Cryptoinfo Advanced
+
+Sets the platform up and tears it down again N times on a minimal hass stub,
+the way a YAML reload does, polling every entity once per cycle against a
+local API server. Reports traced memory, pending tasks, bus listeners and live
+entities per sample and exits non-zero when any of them keeps growing.
+
+Needs homeassistant (and so aiohttp) installed:
+    python scripts/reload_soak.py --reloads 500 --sensors 24
+"""
+
+import argparse
+import asyncio
+import gc
+import os
+import sys
+import tracemalloc
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "custom_components"))
+
+from aiohttp import ClientSession  # noqa: E402
+
+from homeassistant.components.sensor import SensorEntity  # noqa: E402
+
+from cryptoinfo_advanced import crypto_sensor, manager, sensor as platform  # noqa: E402
+from cryptoinfo_advanced.const.const import (  # noqa: E402
+    DOMAIN, PROPERTY_POOL_CONTROL_REMAINING, PROVIDER_BASE_URLS, PROVIDER_COINGECKO, PROVIDER_CRYPTOID, PROVIDER_MEMPOOL,
+)
+from cryptoinfo_advanced.crypto_sensor import CryptoinfoAdvSensor  # noqa: E402
+from cryptoinfo_advanced.manager import CryptoInfoAdvEntityManager  # noqa: E402
+from cryptoinfo_advanced.portfolio_sensor import CryptoinfoAdvPortfolioSensor  # noqa: E402
+
+from scale_harness import HarnessHass, LocalApiServer, build_config  # noqa: E402
+
+
+class SoakBus:
+    def __init__(self):
+        self.listeners = list()
+
+    def async_listen_once(self, event_type, listener):
+        entry = (event_type, listener)
+        self.listeners.append(entry)
+
+        return lambda: self.listeners.remove(entry)
+
+    def async_fire(self, *args, **kwargs):
+        pass
+
+
+class SoakHass(HarnessHass):
+    def __init__(self, loop):
+        super().__init__(loop)
+        self.bus = SoakBus()
+
+
+def build_configs(count):
+    configs = [build_config(index) for index in range(count)]
+
+    # Exercise the per-manager resources that have to be released on every reload
+    configs.append(platform.PLATFORM_SCHEMA({
+        "platform": "cryptoinfo_advanced",
+        "unique_id": "soak_dedicated",
+        "cryptocurrency_name": "coin0",
+        "update_frequency": "1",
+        "http_session": "dedicated",
+        "loop_monitor": True,
+        "serve_stale": True,
+    }))
+    configs.append(platform.PLATFORM_SCHEMA({
+        "platform": "cryptoinfo_advanced",
+        "unique_id": "soak_remaining",
+        "api_mode": "chain_control",
+        "cryptocurrency_name": "btc",
+        "update_frequency": "1",
+        "pool_prefix": [PROPERTY_POOL_CONTROL_REMAINING],
+    }))
+    configs.append(platform.PLATFORM_SCHEMA({
+        "platform": "cryptoinfo_advanced",
+        "unique_id": "soak_portfolio",
+        "api_mode": "portfolio",
+        "update_frequency": "1",
+        "holdings": [
+            {"cryptocurrency_name": "coin0", "amount": 1.5},
+            {"cryptocurrency_name": "coin1", "amount": 2, "wallet": "cold"},
+        ],
+    }))
+
+    return configs
+
+
+def live_entities():
+    return sum(1 for o in gc.get_objects() if isinstance(o, (CryptoinfoAdvSensor, CryptoinfoAdvPortfolioSensor)))
+
+
+async def reload_cycle(hass, configs):
+    entities = list()
+
+    for config in configs:
+        await platform.async_setup_platform(hass, config, entities.extend)
+
+    for index, entity in enumerate(entities):
+        entity.hass = hass
+        entity.entity_id = f"sensor.soak_{index}"
+
+        if isinstance(entity, CryptoinfoAdvPortfolioSensor):
+            CryptoInfoAdvEntityManager.instance(hass).add_portfolio(entity)
+
+    await asyncio.gather(*(
+        entity.async_update() for entity in entities if getattr(entity, "async_update", None) is not None
+    ))
+
+    for entity in entities:
+        await entity.async_will_remove_from_hass()
+
+    # Let the session close and cancelled refreshes finish
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def sample(hass, cycle):
+    gc.collect()
+    current_task = asyncio.current_task()
+
+    return {
+        "reloads": cycle,
+        "traced_kb": round(tracemalloc.get_traced_memory()[0] / 1024, 1),
+        "tasks": sum(1 for t in asyncio.all_tasks() if t is not current_task and not t.done()),
+        "listeners": len(hass.bus.listeners),
+        "live_entities": live_entities(),
+        "manager": DOMAIN in hass.data,
+    }
+
+
+async def run(args):
+    server = LocalApiServer()
+    server.start()
+
+    hass = SoakHass(asyncio.get_running_loop())
+    session = ClientSession()
+    configs = build_configs(args.sensors)
+    samples = list()
+
+    async def no_reload(*args, **kwargs):
+        return None
+
+    with mock.patch.object(SensorEntity, "async_write_ha_state", lambda entity: None), \
+            mock.patch.object(platform, "async_setup_reload_service", no_reload), \
+            mock.patch.object(manager, "async_get_clientsession", lambda hass: session), \
+            mock.patch.dict(PROVIDER_BASE_URLS, {
+                PROVIDER_COINGECKO: f"{server.base_url}coingecko/",
+                PROVIDER_CRYPTOID: f"{server.base_url}cryptoid/",
+                PROVIDER_MEMPOOL: f"{server.base_url}mempool/",
+            }), \
+            mock.patch.object(crypto_sensor, "API_ENDPOINT_NOMP_POOL_STATS", f"{server.base_url}nomp/{{0}}/api/stats"):
+
+        tracemalloc.start()
+
+        for cycle in range(1, args.reloads + 1):
+            await reload_cycle(hass, configs)
+
+            if cycle % args.sample_every == 0:
+                samples.append(sample(hass, cycle))
+                print(samples[-1], flush=True)
+
+        tracemalloc.stop()
+
+    await session.close()
+    server.stop()
+
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--reloads", type=int, default=500)
+    parser.add_argument("--sensors", type=int, default=24, help="sensors per reload besides the fixed ones")
+    parser.add_argument("--sample-every", type=int, default=50)
+    parser.add_argument("--max-growth-kb", type=float, default=512, help="allowed traced memory growth after warm up")
+    args = parser.parse_args()
+
+    samples = asyncio.run(run(args))
+
+    if len(samples) < 2:
+        print("Not enough samples, raise --reloads or lower --sample-every")
+        sys.exit(1)
+
+    # The first sample is the warm up, caches and interned strings settle there
+    (first, last) = (samples[0], samples[-1])
+    failures = [
+        key for key in ["tasks", "listeners", "live_entities"] if last[key] > first[key]
+    ]
+
+    if last["traced_kb"] - first["traced_kb"] > args.max_growth_kb:
+        failures.append("traced_kb")
+
+    if last["manager"]:
+        failures.append("manager")
+
+    if len(failures):
+        print(f"Growing after {last['reloads']} reloads: {', '.join(failures)}")
+        sys.exit(1)
+
+    print(f"Flat after {last['reloads']} reloads")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+"""
+Scale harness for Cryptoinfo Advanced
+
+Builds N sensors through async_setup_platform on a minimal hass stub, polls them
+for a virtual duration against a local API server and reports requests issued,
+event loop time, peak RSS and state writes per entity.
+
+Needs homeassistant (and so aiohttp) installed:
+    python scripts/scale_harness.py --counts 10,100,1000,5000
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+import threading
+import time
+import types
+from datetime import datetime, timedelta, timezone
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "custom_components"))
+
+from aiohttp import ClientSession, web  # noqa: E402
+
+from homeassistant.components.sensor import SensorEntity  # noqa: E402
+import homeassistant.util  # noqa: E402
+
+from cryptoinfo_advanced import crypto_sensor, manager, sensor as platform  # noqa: E402
+from cryptoinfo_advanced.const.const import (  # noqa: E402
+    PROPERTY_POOL_CONTROL_REMAINING, PROVIDER_BASE_URLS, PROVIDER_COINGECKO, PROVIDER_CRYPTOID, PROVIDER_MEMPOOL,
+)
+from cryptoinfo_advanced.manager import CryptoInfoAdvEntityManager  # noqa: E402
+
+CHAIN_COINS = ["btc", "ltc", "doge", "dash"]
+PRICE_COINS = [f"coin{i}" for i in range(50)]
+
+
+class VirtualClock:
+    def __init__(self):
+        self._now = time.time()
+
+    def time(self):
+        return self._now
+
+    def utcnow(self):
+        return datetime.fromtimestamp(self._now, timezone.utc)
+
+    def advance(self, seconds):
+        self._now += seconds
+
+
+class HarnessHass:
+    def __init__(self, loop):
+        self.loop = loop
+        self.data = dict()
+        self.bus = types.SimpleNamespace(async_listen_once=lambda *args, **kwargs: None)
+
+    def async_create_task(self, coro):
+        return self.loop.create_task(coro)
+
+    async def async_add_executor_job(self, target, *args):
+        return await self.loop.run_in_executor(None, target, *args)
+
+
+class LocalApiServer:
+    def __init__(self):
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._loop = asyncio.new_event_loop()
+        self._started = threading.Event()
+        self.base_url = None
+
+    def _count(self):
+        with self._lock:
+            self.requests += 1
+
+    def _json(self, data):
+        self._count()
+        return web.json_response(data)
+
+    async def _price_main(self, request):
+        return self._json([{
+            "current_price": random.uniform(90, 110), "total_volume": 1e9, "market_cap": 1e11,
+            "price_change_percentage_1h_in_currency": random.uniform(-2, 2),
+            "price_change_percentage_24h_in_currency": 1.0, "price_change_percentage_7d_in_currency": 2.0,
+            "price_change_percentage_30d_in_currency": 3.0, "circulating_supply": 1e7, "total_supply": 2.1e7,
+            "ath": 120.0, "atl": 1.0, "low_24h": 90.0, "high_24h": 110.0, "image": "",
+            "ath_date": "2021-11-10T14:24:11.849Z", "atl_date": "2013-07-06T00:00:00.000Z",
+        }])
+
+    async def _price_coin(self, request):
+        currencies = ["usd", "eur"]
+        return self._json({"image": {"large": ""}, "market_data": {
+            "current_price": {c: random.uniform(90, 110) for c in currencies},
+            "total_volume": {c: 1e9 for c in currencies}, "market_cap": {c: 1e11 for c in currencies},
+            "circulating_supply": 1e7, "total_supply": 2.1e7,
+        }})
+
+    async def _price_simple(self, request):
+        currencies = request.query["vs_currencies"].split(",")
+        return self._json({
+            coin: {
+                **{c: random.uniform(90, 110) for c in currencies},
+                **{f"{c}_24h_vol": 1e9 for c in currencies},
+                **{f"{c}_24h_change": 1.0 for c in currencies},
+                **{f"{c}_market_cap": 1e11 for c in currencies},
+            }
+            for coin in request.query["ids"].split(",")
+        })
+
+    async def _dominance(self, request):
+        return self._json({"data": {
+            "market_cap_percentage": {coin: 10.0 for coin in CHAIN_COINS},
+            "total_market_cap": {coin: 1e12 for coin in CHAIN_COINS},
+        }})
+
+    async def _chain_summary(self, request):
+        return self._json({
+            coin: {"height": 800000 + i, "diff": 1e13, "supply": 1.9e7, "hashrate": 4e20}
+            for i, coin in enumerate(CHAIN_COINS)
+        })
+
+    async def _chain_pools(self, request):
+        return self._json({"pools": [
+            {"name": f"pool{i}", "nb100": random.randint(0, 10), "nb1000": random.randint(0, 100)} for i in range(200)
+        ]})
+
+    async def _chain_orphans(self, request):
+        return self._json({"d": int(time.time()) // 86400 - 30, "n": [random.randint(0, 3) for _ in range(30)]})
+
+    async def _nomp_stats(self, request):
+        return self._json({"pools": {
+            f"pool{i}": {
+                "hashrate": random.uniform(1e9, 1e10), "workerCount": 10, "workers": {}, "poolFees": [],
+                "blocks": {"pending": 1, "confirmed": 100, "orphaned": 2},
+                "poolStats": {"height": 800000, "lastBlock": 799990},
+            }
+            for i in range(10)
+        }})
+
+    async def _mempool_fees(self, request):
+        return self._json({"fastestFee": 20, "halfHourFee": 15, "hourFee": 10, "economyFee": 5, "minimumFee": 1})
+
+    def _build_app(self):
+        app = web.Application()
+        app.router.add_get("/coingecko/coins/markets", self._price_main)
+        app.router.add_get("/coingecko/coins/{coin}", self._price_coin)
+        app.router.add_get("/coingecko/simple/price", self._price_simple)
+        app.router.add_get("/coingecko/global", self._dominance)
+        app.router.add_get("/cryptoid/explorer/api.dws", self._chain_summary)
+        app.router.add_get("/cryptoid/explorer/index.pools.dws", self._chain_pools)
+        app.router.add_get("/cryptoid/explorer/index.orphans.dws", self._chain_orphans)
+        app.router.add_get("/nomp/{domain}/api/stats", self._nomp_stats)
+        app.router.add_get("/mempool/v1/fees/recommended", self._mempool_fees)
+        return app
+
+    def _serve(self):
+        asyncio.set_event_loop(self._loop)
+        runner = web.AppRunner(self._build_app(), access_log=None)
+        self._loop.run_until_complete(runner.setup())
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        self._loop.run_until_complete(site.start())
+        port = site._server.sockets[0].getsockname()[1]
+        self.base_url = f"http://127.0.0.1:{port}/"
+        self._started.set()
+        self._loop.run_forever()
+
+    def start(self):
+        threading.Thread(target=self._serve, daemon=True).start()
+        self._started.wait()
+
+    def stop(self):
+        self._loop.call_soon_threadsafe(self._loop.stop)
+
+
+def build_config(index):
+    mode = index % 8
+    config = {
+        "platform": "cryptoinfo_advanced",
+        "id": f"harness {index}",
+        "unique_id": f"harness_{index}",
+        "update_frequency": "1",
+    }
+
+    if mode == 0:
+        config.update(api_mode="price_main", cryptocurrency_name=PRICE_COINS[index % 50], extra_sensors=[
+            {"property": "24h_change", "unique_id": f"harness_{index}_24h_change"},
+            {"property": "rolling_mean", "unique_id": f"harness_{index}_rolling_mean", "window": 60},
+        ])
+    elif mode == 1:
+        config.update(api_mode="price_simple", cryptocurrency_name=PRICE_COINS[index % 50], currency_name=["usd", "eur"])
+    elif mode == 2:
+        config.update(api_mode="dominance", cryptocurrency_name=CHAIN_COINS[index % 4])
+    elif mode == 3:
+        config.update(api_mode="chain_summary", cryptocurrency_name=CHAIN_COINS[index % 4], extra_sensors=[
+            {"property": "block_time_in_seconds", "unique_id": f"harness_{index}_block_time"},
+        ])
+    elif mode == 4:
+        # Every other chain_control sensor reports the share left over by the pools of the others
+        pool_prefix = [PROPERTY_POOL_CONTROL_REMAINING] if index % 16 == 12 else [f"pool{index % 20}"]
+        config.update(api_mode="chain_control", cryptocurrency_name=CHAIN_COINS[index % 4], pool_prefix=pool_prefix)
+    elif mode == 5:
+        config.update(api_mode="chain_orphans", cryptocurrency_name=CHAIN_COINS[index % 4])
+    elif mode == 6:
+        config.update(api_mode="nomp_pool_stats", api_domain_name=f"nomp{index % 5}.local", pool_name=f"pool{index % 10}")
+    else:
+        config.update(api_mode="mempool_fees", cryptocurrency_name="btc")
+
+    return platform.PLATFORM_SCHEMA(config)
+
+
+async def run(count, duration, tick):
+    server = LocalApiServer()
+    server.start()
+
+    loop = asyncio.get_running_loop()
+    hass = HarnessHass(loop)
+    clock = VirtualClock()
+    session = ClientSession()
+    state_writes = dict()
+    entities = list()
+
+    def count_write(entity):
+        state_writes[entity.unique_id] = state_writes.get(entity.unique_id, 0) + 1
+
+    async def no_reload(*args, **kwargs):
+        return None
+
+    with mock.patch("time.time", clock.time), \
+            mock.patch.object(homeassistant.util, "utcnow", clock.utcnow), \
+            mock.patch.object(SensorEntity, "async_write_ha_state", count_write), \
+            mock.patch.object(platform, "async_setup_reload_service", no_reload), \
+            mock.patch.object(manager, "async_get_clientsession", lambda hass: session), \
+            mock.patch.dict(PROVIDER_BASE_URLS, {
+                PROVIDER_COINGECKO: f"{server.base_url}coingecko/",
+                PROVIDER_CRYPTOID: f"{server.base_url}cryptoid/",
+                PROVIDER_MEMPOOL: f"{server.base_url}mempool/",
+            }), \
+            mock.patch.object(crypto_sensor, "API_ENDPOINT_NOMP_POOL_STATS", f"{server.base_url}nomp/{{0}}/api/stats"):
+
+        for index in range(count):
+            await platform.async_setup_platform(hass, build_config(index), entities.extend)
+
+        for index, entity in enumerate(entities):
+            entity.hass = hass
+            entity.entity_id = f"sensor.harness_{index}"
+
+        loop_time_start = time.thread_time()
+        wall_time_start = time.perf_counter()
+
+        for _ in range(int(duration // tick)):
+            clock.advance(tick)
+            await asyncio.gather(*(entity.async_update() for entity in entities))
+
+        loop_time = time.thread_time() - loop_time_start
+        wall_time = time.perf_counter() - wall_time_start
+
+        for entity in entities:
+            CryptoInfoAdvEntityManager.instance(hass).remove_entity(entity)
+
+    await session.close()
+    server.stop()
+
+    return {
+        "sensors": count,
+        "entities": len(entities),
+        "requests": server.requests,
+        "loop_seconds": round(loop_time, 3),
+        "wall_seconds": round(wall_time, 3),
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "writes_per_entity": round(sum(state_writes.values()) / max(len(entities), 1), 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--counts", default="10,100,1000,5000", help="comma separated sensor counts")
+    parser.add_argument("--duration", type=float, default=timedelta(hours=1).total_seconds(), help="virtual seconds")
+    parser.add_argument("--tick", type=float, default=30, help="virtual seconds between polls")
+    parser.add_argument("--run", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run is not None:
+        print(json.dumps(asyncio.run(run(args.run, args.duration, args.tick))))
+        return
+
+    # Every count runs in its own process so peak RSS is not carried over
+    results = list()
+    for count in [int(c) for c in args.counts.split(",")]:
+        output = subprocess.run(
+            [sys.executable, __file__, "--run", str(count), "--duration", str(args.duration), "--tick", str(args.tick)],
+            check=True, capture_output=True, text=True,
+        ).stdout
+        results.append(json.loads(output.strip().splitlines()[-1]))
+
+    columns = list(results[0].keys())
+    print(" | ".join(columns))
+    for result in results:
+        print(" | ".join(str(result[c]) for c in columns))
+
+
+if __name__ == "__main__":
+    main()
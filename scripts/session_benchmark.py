@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+HTTP session benchmark for Cryptoinfo Advanced
+
+Starts one local API server per upstream and sends bursts of concurrent
+requests to them through a connector like the one Home Assistant shares
+between integrations and through the dedicated session connector, then
+reports the connection reuse ratio and request latency of both.
+
+The default pause between bursts is longer than the aiohttp default
+keep-alive, like the polling interval of most sensors.
+
+Needs homeassistant (and so aiohttp) installed:
+    python scripts/session_benchmark.py --bursts 6 --burst-size 16 --interval 20
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "custom_components"))
+
+import aiohttp  # noqa: E402
+from aiohttp import web  # noqa: E402
+
+from homeassistant.helpers.aiohttp_client import MAXIMUM_CONNECTIONS, MAXIMUM_CONNECTIONS_PER_HOST  # noqa: E402
+
+from cryptoinfo_advanced.const.const import (  # noqa: E402
+    CONF_HTTP_LIMIT_PER_HOST, CONF_HTTP_DNS_CACHE_TTL, CONF_HTTP_KEEPALIVE_TIMEOUT,
+)
+from cryptoinfo_advanced.manager import CryptoInfoAdvEntityManager  # noqa: E402
+
+
+class LocalUpstream:
+    def __init__(self, latency):
+        self._latency = latency
+        self._peers = set()
+        self.requests = 0
+        self.base_url = None
+        self._runner = None
+
+    @property
+    def connections(self):
+        return len(self._peers)
+
+    def reset(self):
+        self._peers = set()
+        self.requests = 0
+
+    async def _handle(self, request):
+        # Every new connection comes from a new client port
+        self._peers.add(request.transport.get_extra_info("peername"))
+        self.requests += 1
+        await asyncio.sleep(self._latency)
+
+        return web.json_response({"bitcoin": {"usd": 100.0}})
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_get("/{tail:.*}", self._handle)
+        self._runner = web.AppRunner(app, access_log=None, keepalive_timeout=3600)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        self.base_url = f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}/"
+
+    async def stop(self):
+        await self._runner.cleanup()
+
+
+def shared_connector():
+    # Mirrors the connector behind async_get_clientsession
+    return aiohttp.TCPConnector(
+        limit=MAXIMUM_CONNECTIONS, limit_per_host=MAXIMUM_CONNECTIONS_PER_HOST, enable_cleanup_closed=True,
+    )
+
+
+def dedicated_connector(args):
+    manager = CryptoInfoAdvEntityManager.instance(None)
+    manager.configure_session({
+        CONF_HTTP_LIMIT_PER_HOST: args.limit_per_host,
+        CONF_HTTP_DNS_CACHE_TTL: args.dns_cache_ttl,
+        CONF_HTTP_KEEPALIVE_TIMEOUT: args.keepalive_timeout,
+    })
+
+    return manager.build_session_connector()
+
+
+async def timed_get(session, url):
+    start = time.perf_counter()
+
+    async with session.get(url) as response:
+        await response.text()
+
+    return time.perf_counter() - start
+
+
+async def measure(mode, connector, upstreams, args):
+    for upstream in upstreams:
+        upstream.reset()
+
+    latencies = list()
+
+    async with aiohttp.ClientSession(connector=connector) as session:
+        for burst in range(args.bursts):
+            if burst:
+                await asyncio.sleep(args.interval)
+
+            latencies.extend(await asyncio.gather(*(
+                timed_get(session, f"{upstreams[i % len(upstreams)].base_url}simple/price?request={i}")
+                for i in range(args.burst_size)
+            )))
+
+    requests = sum(upstream.requests for upstream in upstreams)
+    connections = sum(upstream.connections for upstream in upstreams)
+    latencies = np.asarray(latencies) * 1000
+
+    return {
+        "session": mode,
+        "requests": requests,
+        "connections": connections,
+        "reuse_ratio": f"{1 - connections / max(requests, 1):.1%}",
+        "p50_ms": round(float(np.percentile(latencies, 50)), 2),
+        "p95_ms": round(float(np.percentile(latencies, 95)), 2),
+        "max_ms": round(float(latencies.max()), 2),
+    }
+
+
+async def main(args):
+    upstreams = [LocalUpstream(args.server_latency) for _ in range(args.hosts)]
+
+    for upstream in upstreams:
+        await upstream.start()
+
+    try:
+        print(await measure("shared", shared_connector(), upstreams, args))
+        print(await measure("dedicated", dedicated_connector(args), upstreams, args))
+    finally:
+        for upstream in upstreams:
+            await upstream.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--hosts", type=int, default=4, help="upstream servers, one per API")
+    parser.add_argument("--bursts", type=int, default=6)
+    parser.add_argument("--burst-size", type=int, default=16, help="concurrent requests per burst")
+    parser.add_argument("--interval", type=float, default=20.0, help="seconds between bursts")
+    parser.add_argument("--server-latency", type=float, default=0.05, help="seconds")
+    parser.add_argument("--limit-per-host", type=int, default=4)
+    parser.add_argument("--dns-cache-ttl", type=int, default=300)
+    parser.add_argument("--keepalive-timeout", type=float, default=120.0)
+
+    asyncio.run(main(parser.parse_args()))